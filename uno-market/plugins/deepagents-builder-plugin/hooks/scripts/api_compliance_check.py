@@ -12,20 +12,49 @@ Environment Variables:
     FILE_CONTENT: The content being written
     FILE_PATH: The path of the file being written
     CLAUDE_PLUGIN_ROOT: Root directory of the plugin
+    CLAUDE_HOOK_DEBUG: Set to 1 to pretty-print the JSON report
 """
 
+import ast
+import bisect
 import json
 import os
 import re
 import sys
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Iterator, NamedTuple, Optional
 
+try:
+    import ahocorasick
+except ImportError:  # Optional speedup - fall back to a regex alternation
+    ahocorasick = None
 
-@dataclass
-class Violation:
-    """Represents an API compliance violation."""
+try:
+    import orjson
+except ImportError:  # Optional speedup - fall back to the stdlib codec
+    orjson = None
+
+# Larger writes are generated data or accidental dumps, not agent code
+MAX_CONTENT_LENGTH = 4 * 1024 * 1024
+
+_STATEGRAPH_RE = re.compile(r'StateGraph\s*\(')
+_GRAPH_OP_RE = re.compile(r'graph\.(add_node|add_edge|add_conditional_edges)\s*\(')
+_AGENT_INDICATOR_RE = re.compile(r'create_deep_agent|@tool|deepagents|langgraph|langchain')
+# Anything worth checking in a .py file contains at least one of these
+_PY_HINT_RE = re.compile(
+    r'import |def |@tool|StateGraph|create_deep_agent|deepagents|graph\.|pip install|requirements\.txt'
+)
+_GRAPH_OPS = frozenset({'add_node', 'add_edge', 'add_conditional_edges'})
+
+
+class Violation(NamedTuple):
+    """Represents an API compliance violation.
+
+    A plain tuple subclass: violations are created per match on the hot path,
+    so they avoid the per-instance dict of a regular class.
+    """
     severity: str  # CRITICAL, WARNING, INFO
     pattern: str
     reason: str
@@ -34,8 +63,99 @@ class Violation:
     line_number: Optional[int] = None
 
 
+@dataclass
+class CheckCtx:
+    """Derived views of one Python file, computed once and shared by all checks."""
+    content: str
+    tree: Optional[ast.Module]  # None when the content does not parse
+    imports: set[tuple[str, str]]
+    names: set[str]
+    line_starts: list[int]
+    is_agent_code: bool
+
+
+class _RegexAutomaton:
+    """Minimal stand-in for ``ahocorasick.Automaton`` backed by one regex alternation.
+
+    Only the subset used by this hook is implemented: ``add_word``,
+    ``make_automaton`` and ``iter`` (yielding ``(end_index, value)`` pairs).
+    """
+
+    def __init__(self) -> None:
+        self._words: dict[str, Any] = {}
+        self._regex: Optional[re.Pattern] = None
+
+    def add_word(self, key: str, value: Any) -> None:
+        self._words[key] = value
+
+    def make_automaton(self) -> None:
+        keys = sorted(self._words, key=len, reverse=True)
+        # Zero-width lookahead so overlapping keywords are all reported
+        self._regex = re.compile('(?=(?:' + '|'.join(map(re.escape, keys)) + '))')
+
+    def iter(self, content: str) -> Iterator[tuple[int, Any]]:
+        for match in self._regex.finditer(content):
+            start = match.start()
+            for key, value in self._words.items():
+                if content.startswith(key, start):
+                    yield start + len(key) - 1, value
+
+
+def build_automaton(words: list[tuple[str, Any]]):
+    """Build a multi-keyword matcher from ``(keyword, value)`` pairs.
+
+    Uses pyahocorasick when installed, otherwise a regex-based equivalent.
+    Returns None when there is nothing to match.
+    """
+    words = [(key, value) for key, value in words if key]
+    if not words:
+        return None
+
+    automaton = ahocorasick.Automaton() if ahocorasick is not None else _RegexAutomaton()
+    for key, value in words:
+        automaton.add_word(key, value)
+    automaton.make_automaton()
+    return automaton
+
+
+def _compile_patterns(patterns: dict) -> dict:
+    """Attach precompiled matchers to a loaded pattern registry."""
+    # Precompile the forbidden patterns into a single multi-keyword automaton
+    patterns['_automaton'] = build_automaton([
+        (forbidden['pattern'], (i, forbidden))
+        for i, forbidden in enumerate(patterns.get('forbidden_patterns', []))
+    ])
+
+    # Forbidden dependencies as they appear in pyproject.toml:
+    # "langgraph>=...", 'langgraph>=...' or an indented bare entry
+    forbidden_deps = (
+        patterns.get('dependency_rules', {})
+        .get('pyproject_template', {})
+        .get('forbidden_direct_dependencies', [])
+    )
+    patterns['_dependency_automaton'] = build_automaton([
+        (prefix + dep, (i, dep))
+        for i, dep in enumerate(forbidden_deps)
+        for prefix in ('"', "'", '    ')
+    ])
+
+    return patterns
+
+
+@lru_cache(maxsize=4)
+def _load_patterns_cached(path_str: str, mtime_ns: int) -> dict:
+    """Parse and compile a pattern file; cached per (path, modification time)."""
+    with open(path_str, 'rb') as f:
+        patterns = orjson.loads(f.read()) if orjson is not None else json.load(f)
+    return _compile_patterns(patterns)
+
+
 def load_api_patterns() -> dict:
-    """Load API patterns from config file."""
+    """Load API patterns from config file.
+
+    The parsed registry and its matchers are cached and reused until the
+    file's modification time changes.
+    """
     plugin_root = os.environ.get('CLAUDE_PLUGIN_ROOT', '')
     patterns_path = Path(plugin_root) / 'config' / 'api_patterns.json'
     
@@ -44,51 +164,97 @@ def load_api_patterns() -> dict:
         script_dir = Path(__file__).parent.parent.parent
         patterns_path = script_dir / 'config' / 'api_patterns.json'
     
-    if patterns_path.exists():
-        with open(patterns_path) as f:
-            return json.load(f)
-    
-    return {"forbidden_patterns": [], "approved_imports": {}}
+    try:
+        mtime_ns = patterns_path.stat().st_mtime_ns
+    except OSError:
+        return _compile_patterns({"forbidden_patterns": [], "approved_imports": {}})
 
+    return _load_patterns_cached(str(patterns_path), mtime_ns)
+
+
+def compute_line_starts(content: str) -> list[int]:
+    """Return the offset at which each line starts, for bisecting match offsets."""
+    line_starts = [0]
+    offset = content.find('\n')
+    while offset != -1:
+        line_starts.append(offset + 1)
+        offset = content.find('\n', offset + 1)
+    return line_starts
+
+
+def check_forbidden_patterns(ctx: CheckCtx, patterns: dict) -> list[Violation]:
+    """Check content against forbidden patterns in a single pass."""
+    automaton = patterns.get('_automaton')
+    if automaton is None:
+        return []
+
+    # One violation per (pattern, line), reported in pattern order
+    hits = {}
+    for end_idx, (i, forbidden) in automaton.iter(ctx.content):
+        line_num = bisect.bisect_right(ctx.line_starts, end_idx)
+        hits.setdefault((i, line_num), forbidden)
+
+    return [
+        Violation(
+            severity="CRITICAL",
+            pattern=forbidden['pattern'],
+            reason=forbidden['reason'],
+            correction=forbidden['correction'],
+            mcp_query=forbidden['mcp_query'],
+            line_number=line_num
+        )
+        for (_, line_num), forbidden in sorted(hits.items(), key=lambda item: item[0])
+    ]
 
-def check_forbidden_patterns(content: str, patterns: dict) -> list[Violation]:
-    """Check content against forbidden patterns."""
-    violations = []
-    lines = content.split('\n')
-    
-    for forbidden in patterns.get('forbidden_patterns', []):
-        pattern = forbidden['pattern']
-        
-        for line_num, line in enumerate(lines, 1):
-            if pattern in line:
-                violations.append(Violation(
-                    severity="CRITICAL",
-                    pattern=pattern,
-                    reason=forbidden['reason'],
-                    correction=forbidden['correction'],
-                    mcp_query=forbidden['mcp_query'],
-                    line_number=line_num
-                ))
-    
-    return violations
 
+def _index_module(tree: ast.Module) -> tuple[set[tuple[str, str]], set[str]]:
+    """Index a module's imports and referenced names in one AST walk.
 
-def check_missing_primary_imports(content: str, patterns: dict) -> list[Violation]:
+    Returns ``(imports, names)`` where ``imports`` holds every
+    ``(module, name)`` pair from ``from X import Y`` statements and ``names``
+    holds all identifiers referenced via names, attributes or imports.
+    """
+    imports: set[tuple[str, str]] = set()
+    names: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.Attribute):
+            names.add(node.attr)
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                imports.add((node.module or '', alias.name))
+                names.add(alias.name)
+
+    return imports, names
+
+
+def build_ctx(content: str) -> CheckCtx:
+    """Parse and index a Python file once for all checks."""
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        # Partial edits may not parse; checks fall back to text matching
+        tree = None
+
+    imports, names = _index_module(tree) if tree is not None else (set(), set())
+
+    return CheckCtx(
+        content=content,
+        tree=tree,
+        imports=imports,
+        names=names,
+        line_starts=compute_line_starts(content),
+        is_agent_code=bool(_AGENT_INDICATOR_RE.search(content))
+    )
+
+
+def check_missing_primary_imports(ctx: CheckCtx, patterns: dict) -> list[Violation]:
     """Check if primary imports are missing when agent code is detected."""
     violations = []
     
     # Only check if this looks like agent code
-    agent_indicators = [
-        'create_deep_agent',
-        '@tool',
-        'deepagents',
-        'langgraph',
-        'langchain'
-    ]
-    
-    is_agent_code = any(indicator in content for indicator in agent_indicators)
-    
-    if not is_agent_code:
+    if not ctx.is_agent_code:
         return violations
     
     # Check for primary imports
@@ -102,7 +268,12 @@ def check_missing_primary_imports(content: str, patterns: dict) -> list[Violatio
             # Check if the module is imported correctly
             for imp in imports:
                 correct_import = f"from {module} import {imp}"
-                if imp in content and correct_import not in content:
+                if ctx.tree is not None:
+                    missing = imp in ctx.names and (module, imp) not in ctx.imports
+                else:
+                    # Unparseable content: fall back to substring matching
+                    missing = imp in ctx.content and correct_import not in ctx.content
+                if missing:
                     # They're using the function but not importing correctly
                     violations.append(Violation(
                         severity="CRITICAL",
@@ -117,39 +288,83 @@ def check_missing_primary_imports(content: str, patterns: dict) -> list[Violatio
 
 def check_dependency_violations(content: str, patterns: dict) -> list[Violation]:
     """Check pyproject.toml for dependency violations."""
-    violations = []
-    
-    dep_rules = patterns.get('dependency_rules', {}).get('pyproject_template', {})
-    forbidden_deps = dep_rules.get('forbidden_direct_dependencies', [])
-    
-    for dep in forbidden_deps:
-        # Check for dependency in pyproject.toml format
-        dep_patterns = [
-            f'"{dep}',  # "langgraph>=..."
-            f"'{dep}",  # 'langgraph>=...'
-            f'    {dep}',  # indented dependency
-        ]
-        
-        for dep_pattern in dep_patterns:
-            if dep_pattern in content:
-                violations.append(Violation(
-                    severity="CRITICAL",
-                    pattern=f"Forbidden dependency: {dep}",
-                    reason=f"{dep} is a transitive dependency of deepagents",
-                    correction="Remove from dependencies - it's included with deepagents",
-                    mcp_query="deepagents installation dependencies transitive"
-                ))
-                break
-    
-    return violations
+    automaton = patterns.get('_dependency_automaton')
+    if automaton is None:
+        return []
+
+    # Single pass over the file; each dependency is reported once, in config order
+    seen_deps = {}
+    for _, (i, dep) in automaton.iter(content):
+        seen_deps.setdefault(i, dep)
+
+    return [
+        Violation(
+            severity="CRITICAL",
+            pattern=f"Forbidden dependency: {dep}",
+            reason=f"{dep} is a transitive dependency of deepagents",
+            correction="Remove from dependencies - it's included with deepagents",
+            mcp_query="deepagents installation dependencies transitive"
+        )
+        for _, dep in sorted(seen_deps.items())
+    ]
 
 
-def check_raw_stategraph_usage(content: str) -> list[Violation]:
+def _is_stategraph_call(node: Optional[ast.expr]) -> bool:
+    """True for ``StateGraph(...)`` or ``<module>.StateGraph(...)``."""
+    if not isinstance(node, ast.Call):
+        return False
+    func = node.func
+    return (isinstance(func, ast.Name) and func.id == 'StateGraph') or (
+        isinstance(func, ast.Attribute) and func.attr == 'StateGraph'
+    )
+
+
+def _receiver_name(node: ast.expr) -> Optional[str]:
+    """Identifier of a ``name`` or ``obj.name`` receiver, else None."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _find_graph_calls(tree: ast.Module) -> tuple[bool, bool]:
+    """Return (creates StateGraph, calls add_node/add_edge/...) for a module.
+
+    Like the ``graph.add_node(`` regex, graph operations only count when the
+    receiver's name contains ``graph`` or was assigned from ``StateGraph(...)``,
+    so unrelated APIs such as networkx ``G.add_edge`` are not flagged.
+    """
+    creates_graph = False
+    graph_vars = set()
+    receivers = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            if _is_stategraph_call(node):
+                creates_graph = True
+            elif isinstance(node.func, ast.Attribute) and node.func.attr in _GRAPH_OPS:
+                name = _receiver_name(node.func.value)
+                if name is not None:
+                    receivers.add(name)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)) and _is_stategraph_call(node.value):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            graph_vars.update(_receiver_name(target) for target in targets)
+    builds_graph = any('graph' in name or name in graph_vars for name in receivers)
+    return creates_graph, builds_graph
+
+
+def check_raw_stategraph_usage(ctx: CheckCtx) -> list[Violation]:
     """Specifically check for raw StateGraph patterns that indicate old-style code."""
     violations = []
     
+    if ctx.tree is not None:
+        creates_graph, builds_graph = _find_graph_calls(ctx.tree)
+    else:
+        creates_graph = bool(_STATEGRAPH_RE.search(ctx.content))
+        builds_graph = bool(_GRAPH_OP_RE.search(ctx.content))
+    
     # Pattern: Creating a StateGraph instance
-    if re.search(r'StateGraph\s*\(', content):
+    if creates_graph:
         violations.append(Violation(
             severity="CRITICAL",
             pattern="StateGraph instantiation detected",
@@ -159,7 +374,7 @@ def check_raw_stategraph_usage(content: str) -> list[Violation]:
         ))
     
     # Pattern: Manual node/edge addition
-    if re.search(r'graph\.(add_node|add_edge|add_conditional_edges)\s*\(', content):
+    if builds_graph:
         violations.append(Violation(
             severity="CRITICAL",
             pattern="Manual graph construction detected",
@@ -171,22 +386,14 @@ def check_raw_stategraph_usage(content: str) -> list[Violation]:
     return violations
 
 
-def generate_mcp_suggestions(violations: list[Violation]) -> list[dict]:
-    """Generate MCP query suggestions for violations."""
-    suggestions = []
-    seen_queries = set()
-    
-    for v in violations:
-        if v.mcp_query and v.mcp_query not in seen_queries:
-            seen_queries.add(v.mcp_query)
-            suggestions.append({
-                "mcp_server": "langchain-docs",
-                "tool": "SearchDocsByLangChain",
-                "query": v.mcp_query,
-                "reason": v.reason
-            })
-    
-    return suggestions
+def dump_report(report: dict) -> str:
+    """Serialize a report compactly, or pretty-printed when CLAUDE_HOOK_DEBUG=1."""
+    pretty = os.environ.get('CLAUDE_HOOK_DEBUG') == '1'
+    if orjson is not None:
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2 if pretty else 0).decode('utf-8')
+    if pretty:
+        return json.dumps(report, indent=2)
+    return json.dumps(report, separators=(',', ':'))
 
 
 def format_report(violations: list[Violation], mcp_suggestions: list[dict], filepath: str) -> dict:
@@ -229,38 +436,63 @@ def main():
     # Read content from environment or stdin
     content = os.environ.get('FILE_CONTENT', '')
     if not content:
-        content = sys.stdin.read()
+        content = sys.stdin.buffer.read().decode('utf-8', errors='replace')
     
     filepath = os.environ.get('FILE_PATH', 'unknown')
     
     # Skip non-Python files (except pyproject.toml)
     if not filepath.endswith('.py') and not filepath.endswith('pyproject.toml'):
-        print(json.dumps({
+        sys.stdout.write(dump_report({
             "status": "skip",
             "message": "Not a Python file or pyproject.toml",
             "file": filepath
-        }))
+        }) + '\n')
+        sys.exit(0)
+    
+    if len(content) > MAX_CONTENT_LENGTH:
+        sys.stdout.write(dump_report({
+            "status": "skip",
+            "message": f"Content exceeds {MAX_CONTENT_LENGTH} characters",
+            "file": filepath
+        }) + '\n')
+        sys.exit(0)
+    
+    # Nothing to check: empty writes and Python files with no code markers
+    if not content or (filepath.endswith('.py') and not _PY_HINT_RE.search(content)):
+        sys.stdout.write(dump_report(format_report([], [], filepath)) + '\n')
         sys.exit(0)
     
     # Load patterns
     patterns = load_api_patterns()
     
-    # Run all checks
+    # Run all checks, collecting one MCP suggestion per distinct query as we go
     all_violations = []
+    mcp_suggestions = []
+    seen_queries = set()
+    
+    def collect(violations: list[Violation]) -> None:
+        for v in violations:
+            all_violations.append(v)
+            if v.mcp_query and v.mcp_query not in seen_queries:
+                seen_queries.add(v.mcp_query)
+                mcp_suggestions.append({
+                    "mcp_server": "langchain-docs",
+                    "tool": "SearchDocsByLangChain",
+                    "query": v.mcp_query,
+                    "reason": v.reason
+                })
     
     if filepath.endswith('.py'):
-        all_violations.extend(check_forbidden_patterns(content, patterns))
-        all_violations.extend(check_missing_primary_imports(content, patterns))
-        all_violations.extend(check_raw_stategraph_usage(content))
+        ctx = build_ctx(content)
+        collect(check_forbidden_patterns(ctx, patterns))
+        collect(check_missing_primary_imports(ctx, patterns))
+        collect(check_raw_stategraph_usage(ctx))
     elif filepath.endswith('pyproject.toml'):
-        all_violations.extend(check_dependency_violations(content, patterns))
-    
-    # Generate MCP suggestions
-    mcp_suggestions = generate_mcp_suggestions(all_violations)
+        collect(check_dependency_violations(content, patterns))
     
     # Format and output report
     report = format_report(all_violations, mcp_suggestions, filepath)
-    print(json.dumps(report, indent=2))
+    sys.stdout.write(dump_report(report) + '\n')
     
     # Exit with error if critical violations found
     if report["status"] == "fail":
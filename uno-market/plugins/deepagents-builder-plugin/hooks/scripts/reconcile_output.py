@@ -8,40 +8,87 @@ import sys
 import os
 import json
 import re
-from datetime import datetime
-from typing import Any
+import atexit
+import time
+from typing import Any, Iterator
 
+try:
+    import orjson
+except ImportError:  # Optional speedup - fall back to the stdlib codec
+    orjson = None
 
-def extract_code_blocks(content: str) -> list[dict]:
-    """Extract code blocks from subagent output."""
-    pattern = r'```(\w+)?\n(.*?)```'
-    matches = re.findall(pattern, content, re.DOTALL)
-    return [
-        {"language": lang or "text", "code": code.strip()}
-        for lang, code in matches
-    ]
+# (UTC day number, "YYYYMMDD") for the current log file
+_CACHED_DAY: tuple[int, str] | None = None
+
+# Log directories already created and append-mode descriptors per log file
+_LOG_DIRS: set[str] = set()
+_LOG_FDS: dict[str, int] = {}
+
+_CODE_BLOCK_RE = re.compile(r'```(\w+)?\n(.*?)```', re.DOTALL)
+
+# Both file-write phrasings in one alternation so content is scanned once
+_FILE_OP_RE = re.compile(
+    r'(?:create|write|save)\s+(?:file\s+)?[`"\']?(?P<a>[^\s`"\']+\.\w+)[`"\']?'
+    r'|(?:File|Output):\s*[`"\']?(?P<b>[^\s`"\']+\.\w+)[`"\']?',
+    re.IGNORECASE
+)
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON from raw bytes."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _dumpb(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, compact unless ``pretty``."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def iter_code_blocks(content: str) -> Iterator[tuple[str, str]]:
+    """Lazily yield (language, code) pairs for code blocks in subagent output."""
+    for match in _CODE_BLOCK_RE.finditer(content):
+        yield match.group(1) or "text", match.group(2)
 
 
 def extract_file_operations(content: str) -> list[dict]:
     """Identify file operations suggested by subagent."""
-    operations = []
+    # No extension anywhere means no file paths to find
+    if "." not in content:
+        return []
+
+    paths = dict.fromkeys(
+        match.group("a") or match.group("b")
+        for match in _FILE_OP_RE.finditer(content)
+    )
 
-    # Look for file write patterns
-    write_patterns = [
-        r'(?:create|write|save)\s+(?:file\s+)?[`"\']?([^\s`"\']+\.\w+)[`"\']?',
-        r'(?:File|Output):\s*[`"\']?([^\s`"\']+\.\w+)[`"\']?',
+    return [
+        {
+            "type": "write",
+            "path": path,
+            "detected_from": "content_analysis"
+        }
+        for path in paths
     ]
 
-    for pattern in write_patterns:
-        matches = re.findall(pattern, content, re.IGNORECASE)
-        for match in matches:
-            operations.append({
-                "type": "write",
-                "path": match,
-                "detected_from": "content_analysis"
-            })
 
-    return operations
+def iter_strings(obj: Any) -> Iterator[str]:
+    """Yield every string key and value of a nested dict/list, in document order."""
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+        elif isinstance(item, dict):
+            for key, value in reversed(item.items()):
+                stack.append(value)
+                stack.append(key)
+        elif isinstance(item, (list, tuple)):
+            stack.extend(reversed(item))
+        elif item is not None and not isinstance(item, (bool, int, float)):
+            yield str(item)
 
 
 def validate_agent_output(output: dict) -> dict:
@@ -53,27 +100,44 @@ def validate_agent_output(output: dict) -> dict:
     if "messages" not in output and "result" not in output:
         issues.append("Missing 'messages' or 'result' in output")
 
-    # Check for error indicators
-    content = json.dumps(output) if isinstance(output, dict) else str(output)
-
-    if "error" in content.lower():
+    # Walk the string keys/leaves instead of serializing the whole output
+    found_error = False
+    found_todo = False
+    incomplete_language = None
+    code_blocks = 0
+    file_operations: dict[str, dict] = {}
+
+    for text in iter_strings(output):
+        if not found_error and "error" in text.lower():
+            found_error = True
+        if not found_todo and ("TODO" in text or "FIXME" in text):
+            found_todo = True
+
+        # Count code blocks, remembering the first one that looks incomplete
+        if "```" in text:
+            for language, code in iter_code_blocks(text):
+                code_blocks += 1
+                if incomplete_language is None and ("..." in code or "pass  #" in code):
+                    incomplete_language = language
+
+        for operation in extract_file_operations(text):
+            file_operations.setdefault(operation["path"], operation)
+
+    if found_error:
         warnings.append("Output contains error mentions - review required")
 
-    if "TODO" in content or "FIXME" in content:
+    if found_todo:
         warnings.append("Output contains TODO/FIXME markers")
 
-    # Check for incomplete code
-    code_blocks = extract_code_blocks(content)
-    for block in code_blocks:
-        if "..." in block["code"] or "pass  #" in block["code"]:
-            warnings.append(f"Potentially incomplete code in {block['language']} block")
+    if incomplete_language is not None:
+        warnings.append(f"Potentially incomplete code in {incomplete_language} block")
 
     return {
         "valid": len(issues) == 0,
         "issues": issues,
         "warnings": warnings,
-        "code_blocks": len(code_blocks),
-        "file_operations": extract_file_operations(content)
+        "code_blocks": code_blocks,
+        "file_operations": list(file_operations.values())
     }
 
 
@@ -93,7 +157,7 @@ def summarize_output(output: dict, max_length: int = 500) -> str:
         elif "result" in output:
             content = str(output["result"])
         else:
-            content = json.dumps(output)
+            content = _dumpb(output).decode("utf-8")
     else:
         content = str(output)
 
@@ -103,13 +167,28 @@ def summarize_output(output: dict, max_length: int = 500) -> str:
     return content
 
 
+def _day_str() -> str:
+    """Return today's UTC date as YYYYMMDD, recomputed only when the day changes."""
+    global _CACHED_DAY
+    day = int(time.time() // 86400)
+    if _CACHED_DAY is None or _CACHED_DAY[0] != day:
+        _CACHED_DAY = (day, time.strftime("%Y%m%d", time.gmtime(day * 86400)))
+    return _CACHED_DAY[1]
+
+
+def _iso_now() -> str:
+    """Return the current UTC time as an ISO 8601 string with microseconds."""
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds)) + f".{nanos // 1000:06d}Z"
+
+
 def reconcile(agent_name: str, output: dict) -> dict:
     """Main reconciliation logic."""
     validation = validate_agent_output(output)
     summary = summarize_output(output)
 
     result = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": _iso_now(),
         "agent": agent_name,
         "status": "success" if validation["valid"] else "needs_review",
         "validation": validation,
@@ -128,37 +207,67 @@ def reconcile(agent_name: str, output: dict) -> dict:
     return result
 
 
+def _get_log_fd(log_dir: str, date_str: str) -> int:
+    """Return a cached O_APPEND descriptor for the day's subagent log."""
+    if log_dir not in _LOG_DIRS:
+        os.makedirs(log_dir, exist_ok=True)
+        _LOG_DIRS.add(log_dir)
+
+    log_file = os.path.join(log_dir, f"subagent_{date_str}.jsonl")
+    fd = _LOG_FDS.get(log_file)
+    if fd is None:
+        fd = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        _LOG_FDS[log_file] = fd
+    return fd
+
+
+def _close_log_fds() -> None:
+    for fd in _LOG_FDS.values():
+        os.close(fd)
+    _LOG_FDS.clear()
+
+
+atexit.register(_close_log_fds)
+
+
+def dump_report(report: dict) -> str:
+    """Serialize a report compactly, or pretty-printed when CLAUDE_HOOK_DEBUG=1."""
+    return _dumpb(report, pretty=os.environ.get("CLAUDE_HOOK_DEBUG") == "1").decode("utf-8")
+
+
 def main():
     """Main entry point."""
     # Read subagent output from environment or stdin
     agent_name = os.environ.get("AGENT_NAME", "unknown")
-    raw_output = os.environ.get("AGENT_OUTPUT", "")
+    raw_output = os.environ.get("AGENT_OUTPUT", "").encode("utf-8", errors="surrogateescape")
 
     if not raw_output:
-        raw_output = sys.stdin.read()
-
-    # Parse output
-    try:
-        output = json.loads(raw_output) if raw_output.strip().startswith("{") else {"result": raw_output}
-    except json.JSONDecodeError:
-        output = {"result": raw_output}
+        raw_output = sys.stdin.buffer.read()
+
+    # Parse output straight from bytes; only decode when it is not JSON
+    output = None
+    if raw_output.lstrip().startswith(b"{"):
+        try:
+            output = _loads(raw_output)
+        except ValueError:
+            pass
+    if output is None:
+        output = {"result": raw_output.decode("utf-8", errors="replace")}
 
     # Reconcile
     result = reconcile(agent_name, output)
 
     # Output result
-    print(json.dumps(result, indent=2))
+    sys.stdout.write(dump_report(result) + "\n")
 
     # Log to file if configured
     log_dir = os.path.join(
         os.environ.get("CLAUDE_PLUGIN_ROOT", os.path.dirname(__file__) + "/../.."),
         "logs"
     )
-    os.makedirs(log_dir, exist_ok=True)
-
-    log_file = os.path.join(log_dir, f"subagent_{datetime.now().strftime('%Y%m%d')}.jsonl")
-    with open(log_file, "a") as f:
-        f.write(json.dumps(result) + "\n")
+    fd = _get_log_fd(log_dir, _day_str())
+    # One O_APPEND write per record keeps concurrent hook runs from interleaving
+    os.write(fd, _dumpb(result) + b"\n")
 
     # Exit with appropriate code
     if not result["validation"]["valid"]:
@@ -4,34 +4,107 @@ Validate agent code before file creation.
 Checks for security issues, best practices, and common mistakes.
 """
 
+import os
 import sys
 import re
 import ast
 import json
 
-def check_security_issues(content):
-    """Check for common security issues."""
+# Patterns are compiled once at import time; the hook runs on every file write
+_API_KEY_RES = [re.compile(p, re.IGNORECASE) for p in (
+    r'api_key\s*=\s*["\'][^"\']+["\']',
+    r'ANTHROPIC_API_KEY\s*=\s*["\'][^"\']+["\']',
+    r'OPENAI_API_KEY\s*=\s*["\'][^"\']+["\']',
+    r'sk-[a-zA-Z0-9]{32,}',
+)]
+_FUNC_NO_RETTYPE_RE = re.compile(r'def \w+\([^)]*\)(?!\s*->)')
+_TOOL_NO_DOC_RE = re.compile(r'@tool\s+def \w+\([^)]*\):[^\n]*\n\s+(?!""")')
+
+# Security-relevant markers, found in one scan and recorded as bits of a mask
+_FEAT_SUBPROCESS = 1 << 0
+_FEAT_OS_SYSTEM = 1 << 1
+_FEAT_SHELL_TRUE = 1 << 2
+_FEAT_OPEN = 1 << 3
+_FEAT_ROOT_DIR = 1 << 4
+_FEAT_SANDBOX = 1 << 5
+_FEAT_ALL = (1 << 6) - 1
+_FEAT_BITS = {
+    'subprocess': _FEAT_SUBPROCESS,
+    'os_system': _FEAT_OS_SYSTEM,
+    'shell_true': _FEAT_SHELL_TRUE,
+    'open': _FEAT_OPEN,
+    'root_dir': _FEAT_ROOT_DIR,
+    'sandbox': _FEAT_SANDBOX,
+}
+_FEAT_RE = re.compile(
+    r'(?P<subprocess>subprocess)|(?P<os_system>os\.system)|(?P<shell_true>shell=True)'
+    r'|(?P<open>open\()|(?P<root_dir>(?i:root_dir))|(?P<sandbox>(?i:sandbox))'
+)
+
+# Larger writes are generated data or accidental dumps, not agent code
+MAX_CONTENT_LENGTH = 4 * 1024 * 1024
+
+def parse_module(content):
+    """Parse content into an AST, or return None if it is not valid Python."""
+    try:
+        return ast.parse(content)
+    except (SyntaxError, ValueError):
+        return None
+
+def _open_modes(tree):
+    """Return the mode of every builtin ``open()`` call (None when not a literal)."""
+    modes = []
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Name) and node.func.id == 'open'):
+            continue
+        if len(node.args) > 1:
+            mode_node = node.args[1]
+        else:
+            mode_node = next((kw.value for kw in node.keywords if kw.arg == 'mode'), None)
+        if mode_node is None:
+            modes.append('r')
+        elif isinstance(mode_node, ast.Constant) and isinstance(mode_node.value, str):
+            modes.append(mode_node.value)
+        else:
+            modes.append(None)
+    return modes
+
+def _is_write_mode(mode):
+    """Treat dynamic modes as writes; otherwise look for w/a/x/+ flags."""
+    return mode is None or any(flag in mode for flag in 'wax+')
+
+def _scan_features(content):
+    """Return the bitmask of security markers present in content."""
+    mask = 0
+    for match in _FEAT_RE.finditer(content):
+        mask |= _FEAT_BITS[match.lastgroup]
+        if mask == _FEAT_ALL:
+            break
+    return mask
+
+def check_security_issues(content, tree=None):
+    """Check for common security issues.
+    
+    File-write detection inspects ``open()`` calls in the parsed module when
+    available, falling back to a substring heuristic otherwise.
+    """
     issues = []
     
     # Check for hardcoded API keys
-    api_key_patterns = [
-        r'api_key\s*=\s*["\'][^"\']+["\']',
-        r'ANTHROPIC_API_KEY\s*=\s*["\'][^"\']+["\']',
-        r'OPENAI_API_KEY\s*=\s*["\'][^"\']+["\']',
-        r'sk-[a-zA-Z0-9]{32,}',
-    ]
-    
-    for pattern in api_key_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
+    for api_key_re in _API_KEY_RES:
+        if api_key_re.search(content):
             issues.append({
                 "severity": "CRITICAL",
                 "message": "Potential hardcoded API key detected",
                 "suggestion": "Use environment variables: os.environ.get('API_KEY')"
             })
     
+    features = _scan_features(content)
+    
     # Check for unsafe shell commands
-    if 'subprocess' in content or 'os.system' in content:
-        if 'shell=True' in content:
+    if features & (_FEAT_SUBPROCESS | _FEAT_OS_SYSTEM):
+        if features & _FEAT_SHELL_TRUE:
             issues.append({
                 "severity": "WARNING",
                 "message": "Shell=True detected in subprocess call",
@@ -39,8 +112,12 @@ def check_security_issues(content):
             })
     
     # Check for unsafe file operations
-    if 'open(' in content and ('w' in content or 'a' in content):
-        if 'root_dir' not in content.lower() and 'sandbox' not in content.lower():
+    if tree is not None:
+        writes_files = any(_is_write_mode(mode) for mode in _open_modes(tree))
+    else:
+        writes_files = bool(features & _FEAT_OPEN) and ('w' in content or 'a' in content)
+    if writes_files:
+        if not features & (_FEAT_ROOT_DIR | _FEAT_SANDBOX):
             issues.append({
                 "severity": "WARNING",
                 "message": "File write operations without apparent sandboxing",
@@ -49,34 +126,73 @@ def check_security_issues(content):
     
     return issues
 
-def check_best_practices(content):
-    """Check for DeepAgents best practices."""
+def _is_tool_decorator(node):
+    """Return True for ``@tool`` and ``@tool(...)`` decorators."""
+    if isinstance(node, ast.Call):
+        node = node.func
+    return isinstance(node, ast.Name) and node.id == 'tool'
+
+def _scan_best_practices(tree):
+    """Collect best-practice facts from a single walk of the AST."""
+    untyped_count = 0
+    undocumented_tool = False
+    has_try = False
+    uses_agent = False
+    
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if node.returns is None:
+                untyped_count += 1
+            if (not undocumented_tool
+                    and any(_is_tool_decorator(d) for d in node.decorator_list)
+                    and ast.get_docstring(node) is None):
+                undocumented_tool = True
+        elif isinstance(node, (ast.Try, ast.TryStar)):
+            has_try = True
+        elif isinstance(node, ast.Name):
+            uses_agent = uses_agent or node.id == 'create_deep_agent'
+        elif isinstance(node, ast.Attribute):
+            uses_agent = uses_agent or node.attr == 'create_deep_agent'
+        elif isinstance(node, ast.ImportFrom):
+            uses_agent = uses_agent or any(a.name == 'create_deep_agent' for a in node.names)
+    
+    return untyped_count, undocumented_tool, has_try, uses_agent
+
+def check_best_practices(content, tree=None):
+    """Check for DeepAgents best practices.
+    
+    Uses the parsed module when available and falls back to regex
+    heuristics for content that does not parse (e.g. partial edits).
+    """
     issues = []
     
+    if tree is not None:
+        untyped_count, undocumented_tool, has_try, uses_agent = _scan_best_practices(tree)
+    else:
+        untyped_count = len(_FUNC_NO_RETTYPE_RE.findall(content)) if 'def ' in content else 0
+        # Simple check: @tool followed by def without docstring
+        undocumented_tool = '@tool' in content and bool(_TOOL_NO_DOC_RE.search(content))
+        has_try = 'try' in content
+        uses_agent = 'create_deep_agent' in content
+    
     # Check for type hints
-    if 'def ' in content:
-        func_pattern = r'def \w+\([^)]*\)(?!\s*->)'
-        matches = re.findall(func_pattern, content)
-        if matches:
-            issues.append({
-                "severity": "INFO",
-                "message": f"Functions without return type hints: {len(matches)} found",
-                "suggestion": "Add return type annotations for better type safety"
-            })
+    if untyped_count:
+        issues.append({
+            "severity": "INFO",
+            "message": f"Functions without return type hints: {untyped_count} found",
+            "suggestion": "Add return type annotations for better type safety"
+        })
     
     # Check for docstrings in tools
-    if '@tool' in content:
-        # Simple check: @tool followed by def without docstring
-        tool_pattern = r'@tool\s+def \w+\([^)]*\):[^\n]*\n\s+(?!""")'
-        if re.search(tool_pattern, content):
-            issues.append({
-                "severity": "WARNING",
-                "message": "Tool function missing docstring",
-                "suggestion": "Add docstring to @tool functions for LLM to understand usage"
-            })
+    if undocumented_tool:
+        issues.append({
+            "severity": "WARNING",
+            "message": "Tool function missing docstring",
+            "suggestion": "Add docstring to @tool functions for LLM to understand usage"
+        })
     
     # Check for error handling
-    if 'create_deep_agent' in content and 'try' not in content:
+    if uses_agent and not has_try:
         issues.append({
             "severity": "INFO",
             "message": "No error handling detected",
@@ -85,26 +201,39 @@ def check_best_practices(content):
     
     return issues
 
+def dump_report(report):
+    """Serialize a report compactly, or pretty-printed when CLAUDE_HOOK_DEBUG=1."""
+    if os.environ.get('CLAUDE_HOOK_DEBUG') == '1':
+        return json.dumps(report, indent=2)
+    return json.dumps(report, separators=(',', ':'))
+
 def main():
     """Main validation logic."""
     # Read content from environment or stdin
-    import os
-    
     content = os.environ.get('FILE_CONTENT', '')
     if not content:
-        content = sys.stdin.read()
+        content = sys.stdin.buffer.read().decode('utf-8', errors='replace')
     
     # Only validate Python files
     filename = os.environ.get('FILE_PATH', '')
     if not filename.endswith('.py'):
-        print(json.dumps({"status": "skip", "message": "Not a Python file"}))
+        sys.stdout.write(dump_report({"status": "skip", "message": "Not a Python file"}) + '\n')
+        sys.exit(0)
+    
+    if not content:
+        sys.stdout.write(dump_report({"status": "pass", "issues": [], "summary": {"critical": 0, "warning": 0, "info": 0}}) + '\n')
+        sys.exit(0)
+    
+    if len(content) > MAX_CONTENT_LENGTH:
+        sys.stdout.write(dump_report({"status": "skip", "message": f"Content exceeds {MAX_CONTENT_LENGTH} characters"}) + '\n')
         sys.exit(0)
     
     all_issues = []
+    tree = parse_module(content)
     
     # Run checks
-    all_issues.extend(check_security_issues(content))
-    all_issues.extend(check_best_practices(content))
+    all_issues.extend(check_security_issues(content, tree))
+    all_issues.extend(check_best_practices(content, tree))
     
     # Determine overall status
     critical_count = sum(1 for i in all_issues if i['severity'] == 'CRITICAL')
@@ -120,7 +249,7 @@ def main():
         }
     }
     
-    print(json.dumps(result, indent=2))
+    sys.stdout.write(dump_report(result) + '\n')
     
     # Exit with error if critical issues found
     if critical_count > 0:
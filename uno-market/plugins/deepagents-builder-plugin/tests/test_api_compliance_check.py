@@ -0,0 +1,62 @@
+"""Tests for hooks/scripts/api_compliance_check.py"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).parent.parent / "hooks" / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+from api_compliance_check import build_ctx, check_raw_stategraph_usage
+
+NETWORKX_SNIPPET = """\
+import networkx as nx
+
+G = nx.Graph()
+G.add_node(1)
+G.add_edge(1, 2)
+"""
+
+
+def _patterns(content: str) -> list[str]:
+    return [v.pattern for v in check_raw_stategraph_usage(build_ctx(content))]
+
+
+@pytest.mark.parametrize("content", [
+    NETWORKX_SNIPPET,
+    "builder.add_node('a', fn)\n",
+    "tree.add_edge(parent, child)\n",
+])
+def test_unrelated_add_node_calls_are_not_flagged(content):
+    assert _patterns(content) == []
+
+
+@pytest.mark.parametrize("content", [
+    "graph.add_node('a', fn)\n",
+    "workflow_graph.add_edge('a', 'b')\n",
+    "self.graph.add_conditional_edges('a', route)\n",
+])
+def test_graph_receivers_are_flagged(content):
+    assert _patterns(content) == ["Manual graph construction detected"]
+
+
+def test_receiver_assigned_from_stategraph_is_flagged():
+    content = "builder = StateGraph(State)\nbuilder.add_node('a', fn)\n"
+    assert _patterns(content) == [
+        "StateGraph instantiation detected",
+        "Manual graph construction detected",
+    ]
+
+
+def test_networkx_snippet_passes_hook():
+    result = subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / "api_compliance_check.py")],
+        env={**os.environ, "FILE_PATH": "graph_utils.py", "FILE_CONTENT": NETWORKX_SNIPPET},
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stdout
+    assert '"status":"pass"' in result.stdout.replace(" ", "")
@@ -5,13 +5,15 @@ Implements constitution requirement: Investigation-First Methodology
 """
 
 import asyncio
+import codecs
 import json
 import re
 import sys
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
-from urllib.parse import urljoin, urlparse
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse, urlsplit
 
 # Ensure we're running in virtual environment
 sys.path.insert(0, str(Path(__file__).parent))
@@ -22,66 +24,270 @@ except RuntimeError as e:
     print(f"ERROR: {e}", file=sys.stderr)
     sys.exit(1)
 
-import requests
+import aiohttp
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+from playwright.async_api import Browser, async_playwright
+
+try:
+    import ahocorasick
+except ImportError:  # Optional speedup - fall back to per-marker substring search
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # Optional speedup - fall back to the stdlib codec
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # Optional - large endpoint bodies are then parsed in full
+    ijson = None
 
 # Constants
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 TIMEOUT = 30
-
-
+HTML_CHUNK_SIZE = 65536
+HTML_CONTENT_TYPES = frozenset({"text/html", "application/xhtml+xml"})
+HTML_ACCEPT_HEADERS = {"Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8"}
+CONNECTIONS_PER_HOST = 8
+KEEPALIVE_TIMEOUT = 30
+DNS_CACHE_TTL = 300
+BATCH_CONCURRENCY = 16
+STREAM_JSON_THRESHOLD = 65536
+BROWSER_ARGS = ["--disable-gpu", "--disable-dev-shm-usage"]
+REQUIRED_FIELDS = frozenset({"title", "name", "price", "image", "images"})
+# Score bonus indexed by best endpoint confidence: low, medium, high
+ENDPOINT_CONFIDENCE_BONUS = (0.2, 0.4, 0.6)
+PAGINATION_KEYS = frozenset({"next", "page", "total_pages", "has_more", "offset", "limit"})
+COMMON_API_PATHS = (
+    "/api/products",
+    "/api/v1/products",
+    "/api/v2/products",
+    "/products.json"
+)
+
+
+def _loads(data: bytes):
+    """Parse JSON from raw bytes"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+@lru_cache(maxsize=1)
 def load_platform_patterns() -> Dict:
-    """Load platform detection patterns from config"""
+    """Load platform detection patterns from config (parsed once per process)"""
     config_path = Path(__file__).parent.parent / "config" / "platform_patterns.json"
-    with open(config_path) as f:
-        return json.load(f)
+    with open(config_path, "rb") as f:
+        return _loads(f.read())
 
 
-def detect_platform(html: str, url: str) -> tuple[str, str]:
-    """Detect platform type from HTML content
+class _SubstringMatcher:
+    """Fallback for ``ahocorasick.Automaton``: one substring search per keyword"""
+
+    def __init__(self):
+        self._words = {}
+
+    def add_word(self, key: str, value) -> None:
+        self._words[key] = value
+
+    def make_automaton(self) -> None:
+        pass
+
+    def iter(self, text: str):
+        for key, value in self._words.items():
+            index = text.find(key)
+            if index != -1:
+                yield index + len(key) - 1, value
+
+
+@lru_cache(maxsize=1)
+def build_platform_matcher() -> Tuple[Optional[object], List[Tuple[str, Optional[str], int]], int]:
+    """Compile all case-sensitive platform markers into one automaton
 
     Returns:
-        tuple: (platform_name, confidence_level)
+        tuple: (automaton or None,
+                [(platform_name, meta_tag, max_score), ...] in config order,
+                length of the longest marker or meta tag)
     """
     patterns = load_platform_patterns()
+    keywords: Dict[str, List[Tuple[str, int]]] = {}
+    platforms = []
 
     for platform_name, platform_config in patterns.items():
         if platform_name == "custom":
             continue
 
         detection = platform_config.get("detection", {})
-        score = 0
-        max_score = 0
+        markers = []
+        if detection.get("script_src"):
+            markers.append(detection["script_src"])
+        markers.extend(detection.get("html_patterns", []))
 
-        # Check meta tag
-        if detection.get("meta_tag"):
-            max_score += 1
-            if detection["meta_tag"].lower() in html.lower():
-                score += 1
+        # Each marker is one scoring slot; the same string may serve several
+        for slot, marker in enumerate(markers):
+            keywords.setdefault(marker, []).append((platform_name, slot))
 
-        # Check script sources
-        if detection.get("script_src"):
-            max_score += 1
-            if detection["script_src"] in html:
-                score += 1
-
-        # Check HTML patterns
-        html_patterns = detection.get("html_patterns", [])
-        if html_patterns:
-            max_score += len(html_patterns)
-            for pattern in html_patterns:
-                if pattern in html:
+        meta_tag = detection.get("meta_tag")
+        platforms.append((platform_name, meta_tag, len(markers) + (1 if meta_tag else 0)))
+
+    keywords.pop("", None)
+    longest_marker = max(
+        [len(marker) for marker in keywords] + [len(meta) for _, meta, _ in platforms if meta],
+        default=0
+    )
+    if not keywords:
+        return None, platforms, longest_marker
+
+    automaton = ahocorasick.Automaton() if ahocorasick is not None else _SubstringMatcher()
+    for marker, slots in keywords.items():
+        automaton.add_word(marker, slots)
+    automaton.make_automaton()
+
+    return automaton, platforms, longest_marker
+
+
+@lru_cache(maxsize=1)
+def build_header_rules() -> List[Tuple[str, List[Tuple[str, str]]]]:
+    """Collect response-header rules from each platform's ``detection.headers``
+
+    A rule matches when the header is present and, if a value is given,
+    contains it case-insensitively. Header names are stored lowercased.
+
+    Returns:
+        list: [(platform_name, [(header, value), ...]), ...] in config order
+    """
+    rules = []
+    for platform_name, platform_config in load_platform_patterns().items():
+        headers = platform_config.get("detection", {}).get("headers") or {}
+        if headers:
+            rules.append((
+                platform_name,
+                [(name.lower(), (value or "").lower()) for name, value in headers.items()]
+            ))
+    return rules
+
+
+class PlatformDetector:
+    """Incremental platform detection over HTML fed in chunks
+
+    Markers split across chunk boundaries are still found because the last
+    ``overlap`` characters of each chunk are rescanned with the next one.
+    """
+
+    def __init__(self):
+        self._automaton, self._platforms, longest_marker = build_platform_matcher()
+        self._matched: Dict[str, set] = {}
+        self._meta_found: set = set()
+        self._tail = ""
+        self._overlap = max(longest_marker - 1, 0)
+        self._header_match: Optional[str] = None
+
+    def feed_headers(self, headers) -> None:
+        """Check response headers against the platforms' header rules
+
+        A matching header is treated as definitive (high confidence).
+        """
+        if self._header_match is not None:
+            return
+
+        for platform_name, rules in build_header_rules():
+            for name, value in rules:
+                header_value = headers.get(name)
+                if header_value is not None and value in header_value.lower():
+                    self._header_match = platform_name
+                    return
+
+    def feed(self, chunk: str) -> None:
+        """Scan the next piece of HTML"""
+        text = self._tail + chunk
+
+        # Single pass for every script_src / html_patterns marker
+        if self._automaton is not None:
+            for _, slots in self._automaton.iter(text):
+                for platform_name, slot in slots:
+                    self._matched.setdefault(platform_name, set()).add(slot)
+
+        # Meta tags match case-insensitively; lowercase the text once, not per platform
+        text_lower = text.lower()
+        for platform_name, meta_tag, _ in self._platforms:
+            if meta_tag and platform_name not in self._meta_found and meta_tag.lower() in text_lower:
+                self._meta_found.add(platform_name)
+
+        self._tail = text[-self._overlap:] if self._overlap else ""
+
+    def _confidences(self):
+        if self._header_match is not None:
+            yield self._header_match, 1.0
+        for platform_name, _, max_score in self._platforms:
+            if max_score > 0:
+                score = len(self._matched.get(platform_name, ()))
+                if platform_name in self._meta_found:
                     score += 1
+                yield platform_name, score / max_score
+
+    def is_confident(self) -> bool:
+        """True once any platform reaches high confidence"""
+        return any(confidence >= 0.7 for _, confidence in self._confidences())
 
-        if max_score > 0:
-            confidence = score / max_score
+    def result(self) -> tuple[str, str]:
+        """Return (platform_name, confidence_level) for the HTML seen so far"""
+        for platform_name, confidence in self._confidences():
             if confidence >= 0.7:
                 return platform_name, "high"
             elif confidence >= 0.4:
                 return platform_name, "medium"
 
-    return "custom", "low"
+        return "custom", "low"
+
+
+def detect_platform(html: str, url: str) -> tuple[str, str]:
+    """Detect platform type from HTML content
+
+    Returns:
+        tuple: (platform_name, confidence_level)
+    """
+    detector = PlatformDetector()
+    detector.feed(html)
+    return detector.result()
+
+
+async def fetch_and_detect_platform(session: aiohttp.ClientSession, url: str) -> tuple[str, str]:
+    """Stream the landing page through the platform detector
+
+    Response headers are checked first, then the body is read until a
+    platform reaches high confidence, so the full page is neither buffered
+    nor necessarily downloaded.
+
+    Returns:
+        tuple: (platform_name, confidence_level)
+    """
+    detector = PlatformDetector()
+
+    async with session.get(url, headers=HTML_ACCEPT_HEADERS) as response:
+        response.raise_for_status()
+
+        # Headers arrive before the body; a definitive one skips the download
+        detector.feed_headers(response.headers)
+        if detector.is_confident():
+            return detector.result()
+
+        # JSON, XML, images etc. never carry HTML platform markers
+        mimetype = response.headers.get("content-type", "").split(";")[0].strip().lower()
+        if mimetype and mimetype not in HTML_CONTENT_TYPES:
+            return "custom", "low"
+
+        try:
+            decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+        async for chunk in response.content.iter_chunked(HTML_CHUNK_SIZE):
+            detector.feed(decoder.decode(chunk))
+            if detector.is_confident():
+                break
+        else:
+            detector.feed(decoder.decode(b"", final=True))
+
+    return detector.result()
 
 
 def get_candidate_endpoints(base_url: str, platform: str) -> List[str]:
@@ -89,107 +295,230 @@ def get_candidate_endpoints(base_url: str, platform: str) -> List[str]:
     patterns = load_platform_patterns()
     platform_config = patterns.get(platform, patterns["custom"])
 
+    # Candidate paths are origin-relative, so join by concatenation
+    # instead of re-parsing base_url in urljoin for every path
+    parts = urlsplit(base_url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+
     endpoints = []
+    seen = set()
+
+    def add(path: str):
+        if not path.startswith("/"):
+            path = "/" + path
+        full_url = f"{origin}{path}"
+        if full_url not in seen:
+            seen.add(full_url)
+            endpoints.append(full_url)
+
     for endpoint_template in platform_config.get("api_endpoints", []):
         # Replace template variables
         endpoint = endpoint_template.replace("{handle}", "all")
         endpoint = endpoint.replace("{product_id}", "")
-        full_url = urljoin(base_url, endpoint)
-        endpoints.append(full_url)
+        add(endpoint)
 
     # Add common generic endpoints
-    common_paths = [
-        "/api/products",
-        "/api/v1/products",
-        "/api/v2/products",
-        "/products.json"
-    ]
-
-    for path in common_paths:
-        full_url = urljoin(base_url, path)
-        if full_url not in endpoints:
-            endpoints.append(full_url)
+    for path in COMMON_API_PATHS:
+        add(path)
 
     return endpoints
 
 
-def test_endpoint(url: str, timeout: int = TIMEOUT) -> Optional[Dict]:
+def analyze_endpoint_data(url: str, status_code: int, content_type: str, data) -> Dict:
+    """Build endpoint details from a decoded JSON response"""
+    # Analyze data structure
+    sample_fields = []
+    pagination_detected = False
+
+    if isinstance(data, dict):
+        if "products" in data:
+            items = data["products"]
+            if items:
+                sample_fields = list(items[0].keys())
+        elif "items" in data:
+            items = data["items"]
+            if items:
+                sample_fields = list(items[0].keys())
+        else:
+            sample_fields = list(data.keys())
+
+        # Check for pagination indicators
+        pagination_detected = not PAGINATION_KEYS.isdisjoint(data)
+
+    # Determine confidence based on field completeness
+    field_matches = len(REQUIRED_FIELDS.intersection(f.lower() for f in sample_fields))
+
+    if field_matches >= 3:
+        confidence = "high"
+    elif field_matches >= 2:
+        confidence = "medium"
+    else:
+        confidence = "low"
+
+    return {
+        "url": url,
+        "method": "GET",
+        "response_type": content_type,
+        "confidence": confidence,
+        "tested": True,
+        "status_code": status_code,
+        "sample_fields": sample_fields[:10],  # Limit to first 10
+        "pagination_detected": pagination_detected
+    }
+
+
+async def summarize_json_stream(stream: aiohttp.StreamReader):
+    """Stream-parse a JSON body into the skeleton analyze_endpoint_data needs
+
+    Only top-level keys and the keys of the first "products"/"items" entry
+    are kept; values are never materialized. Parsing stops as soon as the
+    payload is known not to be an object, or once the first product and a
+    pagination key have both been seen.
+
+    Raises:
+        ValueError: If the body is not valid JSON
+    """
+    skeleton = {}
+    # Prefixes still of interest; each is dropped once its first entry is read
+    watched = {"products", "items", "products.item", "items.item"}
+    collecting = None
+    first_product_done = False
+    pagination_seen = False
+
+    try:
+        async for prefix, event, value in ijson.parse_async(stream):
+            if not prefix:
+                if event == "map_key":
+                    skeleton[value] = None
+                    pagination_seen = pagination_seen or value in PAGINATION_KEYS
+                elif event not in ("start_map", "end_map"):
+                    return []  # Top-level array or scalar - nothing to analyze
+                else:
+                    continue
+            elif prefix not in watched:
+                continue
+            elif event == "start_array" and prefix in ("products", "items"):
+                skeleton[prefix] = []
+                watched.discard(prefix)
+                continue
+            elif prefix in ("products", "items"):
+                # Not an array, or an empty one
+                watched.discard(prefix)
+                watched.discard(prefix + ".item")
+                first_product_done = first_product_done or prefix == "products"
+            elif collecting is None:
+                key = prefix[:-5]
+                if event == "start_map":
+                    collecting = key
+                    skeleton[key].append({})
+                    continue
+                # First entry is not an object
+                skeleton[key].append(None)
+                watched.discard(prefix)
+                first_product_done = first_product_done or key == "products"
+            elif event == "map_key":
+                skeleton[collecting][0][value] = None
+                continue
+            elif event == "end_map":
+                watched.discard(prefix)
+                first_product_done = first_product_done or collecting == "products"
+                collecting = None
+            else:
+                continue
+
+            if first_product_done and pagination_seen:
+                break
+    except ijson.JSONError as e:
+        raise ValueError(str(e)) from e
+
+    return skeleton
+
+
+async def test_endpoint_async(session: aiohttp.ClientSession, url: str) -> Optional[Dict]:
     """Test if endpoint is accessible and returns valid JSON
 
     Returns:
         Dict with endpoint details or None if invalid
     """
     try:
-        response = requests.get(
-            url,
-            headers={"User-Agent": USER_AGENT},
-            timeout=timeout
-        )
-
-        if response.status_code != 200:
-            return None
-
-        content_type = response.headers.get("content-type", "")
-        if "application/json" not in content_type:
-            return None
-
-        data = response.json()
-
-        # Analyze data structure
-        sample_fields = []
-        pagination_detected = False
-
-        if isinstance(data, dict):
-            if "products" in data:
-                items = data["products"]
-                if items:
-                    sample_fields = list(items[0].keys())
-            elif "items" in data:
-                items = data["items"]
-                if items:
-                    sample_fields = list(items[0].keys())
+        async with session.get(url) as response:
+            if response.status != 200:
+                return None
+
+            content_type = response.headers.get("content-type", "")
+            if "application/json" not in content_type:
+                return None
+
+            # Large or unsized bodies are summarized without building the tree
+            length = response.content_length
+            if ijson is not None and (length is None or length >= STREAM_JSON_THRESHOLD):
+                data = await summarize_json_stream(response.content)
             else:
-                sample_fields = list(data.keys())
+                data = _loads(await response.read())
 
-            # Check for pagination indicators
-            pagination_keys = ["next", "page", "total_pages", "has_more", "offset", "limit"]
-            pagination_detected = any(key in data for key in pagination_keys)
+        return analyze_endpoint_data(url, response.status, content_type, data)
 
-        # Determine confidence based on field completeness
-        required_fields = {"title", "name", "price", "image", "images"}
-        found_fields = set(f.lower() for f in sample_fields)
-        field_matches = len(required_fields & found_fields)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, KeyError):
+        return None
 
-        if field_matches >= 3:
-            confidence = "high"
-        elif field_matches >= 2:
-            confidence = "medium"
-        else:
-            confidence = "low"
 
-        return {
-            "url": url,
-            "method": "GET",
-            "response_type": content_type,
-            "confidence": confidence,
-            "tested": True,
-            "status_code": response.status_code,
-            "sample_fields": sample_fields[:10],  # Limit to first 10
-            "pagination_detected": pagination_detected
-        }
+async def probe_endpoints(session: aiohttp.ClientSession, urls: List[str]) -> List[Dict]:
+    """Test endpoints concurrently, keeping only valid results in input order"""
+    results = await asyncio.gather(
+        *(test_endpoint_async(session, url) for url in urls),
+        return_exceptions=True
+    )
+    return [r for r in results if isinstance(r, dict)]
+
+
+def create_session(timeout: int = TIMEOUT) -> aiohttp.ClientSession:
+    """Create the HTTP session shared by all probes of an investigation
+
+    The pooled connector keeps connections alive between probes, so the
+    candidate endpoints on one origin reuse a handful of TLS handshakes.
+    Resolved hosts stay cached for the session, so each hostname is looked
+    up once: the landing-page fetch warms the cache for every probe on
+    that origin.
+    """
+    connector = aiohttp.TCPConnector(
+        limit_per_host=CONNECTIONS_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers={"User-Agent": USER_AGENT},
+        timeout=aiohttp.ClientTimeout(total=timeout)
+    )
 
-    except (requests.RequestException, json.JSONDecodeError, KeyError):
-        return None
 
+async def launch_browser(playwright) -> Browser:
+    """Launch the headless Chromium used for network capture"""
+    return await playwright.chromium.launch(headless=True, args=BROWSER_ARGS)
 
-async def capture_network_requests(url: str) -> List[str]:
-    """Capture JSON API calls using Playwright"""
+
+async def capture_network_requests(url: str, browser: Optional[Browser] = None) -> List[str]:
+    """Capture JSON API calls using Playwright
+
+    Args:
+        url: Page to load
+        browser: Shared browser; a private one is launched when omitted
+    """
     api_calls = []
 
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
+        if browser is None:
+            async with async_playwright() as p:
+                browser = await launch_browser(p)
+                try:
+                    return await capture_network_requests(url, browser)
+                finally:
+                    await browser.close()
+
+        # A fresh context per URL keeps cookies and cache isolated
+        context = await browser.new_context()
+        try:
+            page = await context.new_page()
 
             async def handle_response(response):
                 content_type = response.headers.get("content-type", "")
@@ -200,8 +529,8 @@ async def capture_network_requests(url: str) -> List[str]:
 
             await page.goto(url, timeout=TIMEOUT * 1000)
             await page.wait_for_load_state("networkidle", timeout=TIMEOUT * 1000)
-
-            await browser.close()
+        finally:
+            await context.close()
 
     except Exception as e:
         print(f"Warning: Network capture failed: {e}", file=sys.stderr)
@@ -218,77 +547,85 @@ def calculate_confidence_score(discovered_endpoints: List[Dict], platform_confid
     platform_scores = {"high": 0.3, "medium": 0.2, "low": 0.1}
     score = platform_scores.get(platform_confidence, 0.1)
 
-    # Add score from discovered endpoints
-    high_conf_endpoints = [e for e in discovered_endpoints if e["confidence"] == "high"]
-    medium_conf_endpoints = [e for e in discovered_endpoints if e["confidence"] == "medium"]
+    # Add score from the best endpoint confidence (one pass, stops at "high")
+    best = 0
+    for endpoint in discovered_endpoints:
+        confidence = endpoint["confidence"]
+        if confidence == "high":
+            best = 2
+            break
+        if confidence == "medium":
+            best = 1
 
-    if high_conf_endpoints:
-        score += 0.6
-    elif medium_conf_endpoints:
-        score += 0.4
-    elif discovered_endpoints:
-        score += 0.2
+    score += ENDPOINT_CONFIDENCE_BONUS[best]
 
     return min(score, 1.0)
 
 
-async def investigate_url(target_url: str) -> Dict:
+async def investigate_url(
+    target_url: str,
+    session: Optional[aiohttp.ClientSession] = None,
+    browser: Optional[Browser] = None,
+    force_network_capture: bool = False
+) -> Dict:
     """Main investigation function
 
+    Args:
+        target_url: URL to investigate
+        session: Shared HTTP session; a private one is created when omitted
+        browser: Shared browser for network capture; launched per call when omitted
+        force_network_capture: Run network capture even when probing already
+            found a high-confidence endpoint
+
     Returns:
         InvestigationReport dict
     """
+    if session is None:
+        async with create_session() as session:
+            return await investigate_url(target_url, session, browser, force_network_capture)
+
     start_time = datetime.utcnow()
 
-    # Phase 1: Fetch initial page
+    # Phase 1 + 2: Stream the initial page and detect platform
     try:
-        response = requests.get(
-            target_url,
-            headers={"User-Agent": USER_AGENT},
-            timeout=TIMEOUT
-        )
-        response.raise_for_status()
-        html = response.text
-    except requests.RequestException as e:
+        platform, platform_confidence = await fetch_and_detect_platform(session, target_url)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         return {
             "error": "network_unreachable",
-            "message": str(e),
+            "message": str(e) or type(e).__name__,
             "target_url": target_url
         }
 
-    # Phase 2: Detect platform
-    platform, platform_confidence = detect_platform(html, target_url)
-
     # Phase 3: Get candidate endpoints
     parsed_url = urlparse(target_url)
     base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
     candidates = get_candidate_endpoints(base_url, platform)
 
     # Phase 4: Test endpoints in parallel
-    discovered_endpoints = []
-    for candidate in candidates:
-        result = test_endpoint(candidate)
-        if result:
-            discovered_endpoints.append(result)
+    discovered_endpoints = await probe_endpoints(session, candidates)
 
     # Phase 5: Capture network requests (for JavaScript-heavy sites)
-    try:
-        network_apis = await capture_network_requests(target_url)
-        for api_url in network_apis:
-            if api_url not in [e["url"] for e in discovered_endpoints]:
-                result = test_endpoint(api_url)
-                if result:
-                    discovered_endpoints.append(result)
-    except Exception:
-        pass  # Network capture is optional
+    # A browser is only worth launching when probing found nothing definitive
+    techniques_used = ["platform_detection", "known_endpoints", "common_path_probing"]
+    have_high = any(e["confidence"] == "high" for e in discovered_endpoints)
+    if force_network_capture or not have_high:
+        techniques_used.append("network_capture")
+        try:
+            network_apis = await capture_network_requests(target_url, browser)
+            known_urls = {e["url"] for e in discovered_endpoints}
+            new_apis = []
+            for api_url in network_apis:
+                if api_url not in known_urls:
+                    known_urls.add(api_url)
+                    new_apis.append(api_url)
+            discovered_endpoints.extend(await probe_endpoints(session, new_apis))
+        except Exception:
+            pass  # Network capture is optional
 
     # Phase 6: Calculate confidence and recommend strategy
     confidence_score = calculate_confidence_score(discovered_endpoints, platform_confidence)
 
-    high_conf_endpoints = [e for e in discovered_endpoints if e["confidence"] == "high"]
-    if high_conf_endpoints:
-        recommended_strategy = "api"
-    elif discovered_endpoints:
+    if discovered_endpoints:
         recommended_strategy = "api"
     else:
         recommended_strategy = "browser"
@@ -308,16 +645,41 @@ async def investigate_url(target_url: str) -> Dict:
             "investigation_duration_seconds": round(duration, 2),
             "endpoints_probed": len(candidates),
             "endpoints_found": len(discovered_endpoints),
-            "techniques_used": [
-                "platform_detection",
-                "known_endpoints",
-                "common_path_probing",
-                "network_capture"
-            ]
+            "techniques_used": techniques_used
         }
     }
 
 
+async def investigate_urls(
+    urls: List[str],
+    concurrency: int = BATCH_CONCURRENCY,
+    force_network_capture: bool = False
+) -> List[Dict]:
+    """Investigate several URLs concurrently over one HTTP session and one browser
+
+    Args:
+        urls: URLs to investigate
+        concurrency: Maximum number of investigations in flight
+        force_network_capture: Passed through to investigate_url
+
+    Returns:
+        InvestigationReport dicts in input order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with create_session() as session, async_playwright() as p:
+        browser = await launch_browser(p)
+
+        async def run(url: str) -> Dict:
+            async with semaphore:
+                return await investigate_url(url, session, browser, force_network_capture)
+
+        try:
+            return await asyncio.gather(*(run(url) for url in urls))
+        finally:
+            await browser.close()
+
+
 def main():
     """CLI entry point"""
     import argparse
@@ -327,8 +689,14 @@ def main():
     )
     parser.add_argument(
         "url",
+        nargs="?",
         help="Target URL to investigate"
     )
+    parser.add_argument(
+        "--urls-file",
+        type=Path,
+        help="Investigate every URL in a newline-delimited file (reports are printed as a JSON list)"
+    )
     parser.add_argument(
         "--deep-scan",
         action="store_true",
@@ -339,6 +707,11 @@ def main():
         type=Path,
         help="Custom API patterns JSON file (overrides default config/api_patterns.json)"
     )
+    parser.add_argument(
+        "--force-network-capture",
+        action="store_true",
+        help="Capture browser network traffic even when a high-confidence endpoint was already found"
+    )
     parser.add_argument(
         "--timeout",
         type=int,
@@ -353,6 +726,9 @@ def main():
 
     args = parser.parse_args()
 
+    if (args.url is None) == (args.urls_file is None):
+        parser.error("provide either a URL or --urls-file")
+
     # Load custom API patterns if provided
     custom_patterns = None
     if args.api_patterns:
@@ -373,11 +749,21 @@ def main():
 
     # TODO: Pass deep_scan and custom_patterns to investigate_url when implementing
     # For now, use standard investigation
-    report = asyncio.run(investigate_url(args.url))
-
-    if "error" in report:
-        print(json.dumps(report, indent=2), file=sys.stderr)
-        sys.exit(1)
+    if args.urls_file:
+        if not args.urls_file.exists():
+            print(f"Error: URLs file not found: {args.urls_file}", file=sys.stderr)
+            sys.exit(1)
+        with open(args.urls_file, "r") as f:
+            urls = [line.strip() for line in f if line.strip()]
+        report = asyncio.run(investigate_urls(urls, force_network_capture=args.force_network_capture))
+        # Per-URL failures stay in the list; the exit code still reflects them
+        failed = any("error" in r for r in report)
+    else:
+        report = asyncio.run(investigate_url(args.url, force_network_capture=args.force_network_capture))
+        if "error" in report:
+            print(json.dumps(report, indent=2), file=sys.stderr)
+            sys.exit(1)
+        failed = False
 
     # Save to file if requested
     if args.output:
@@ -387,7 +773,7 @@ def main():
 
     # Print to stdout
     print(json.dumps(report, indent=2))
-    sys.exit(0)
+    sys.exit(1 if failed else 0)
 
 
 if __name__ == "__main__":
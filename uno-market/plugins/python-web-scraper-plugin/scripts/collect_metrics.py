@@ -7,10 +7,62 @@ Implements T064 - Metrics collection system
 
 import json
 import sys
-from datetime import datetime
+import time
+import weakref
+from collections import deque
 from pathlib import Path
 from typing import Dict, Optional
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locking
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:  # Optional speedup - fall back to the stdlib codec
+    orjson = None
+
+
+def _dumpb(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _iso_from_ns(timestamp_ns: int) -> str:
+    """Format Unix nanoseconds as an ISO 8601 UTC string with microseconds"""
+    seconds, nanos = divmod(timestamp_ns, 1_000_000_000)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds)) + f".{nanos // 1000:06d}Z"
+
+
+def _write_lines(fh, buf: deque):
+    """Write and clear buffered JSONL lines under an exclusive file lock"""
+    if not buf:
+        return
+
+    # Lock so concurrent scraper processes never interleave lines
+    if fcntl is not None:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+    try:
+        fh.writelines(buf)
+        fh.flush()
+    finally:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+    buf.clear()
+
+
+def _write_and_close(fh, buf: deque):
+    """Flush pending lines and close the handle (finalizer; holds no collector ref)"""
+    if not fh.closed:
+        try:
+            _write_lines(fh, buf)
+        finally:
+            fh.close()
+
 
 class MetricsCollector:
     """Collects and logs scraping metrics"""
@@ -29,6 +81,30 @@ class MetricsCollector:
         self.metrics_dir.mkdir(exist_ok=True)
         self.metrics_file = self.metrics_dir / "scraping_metrics.jsonl"
 
+        # One append handle for the collector's lifetime; serialized entries
+        # are buffered and written in batches
+        self._fh = open(self.metrics_file, "ab")
+        self._buf = deque()
+        self._buf_max = 128
+        # Safety net for collectors never closed explicitly: flushes when the
+        # collector is garbage-collected or at interpreter exit, without the
+        # exit hook keeping the collector alive
+        self._finalizer = weakref.finalize(self, _write_and_close, self._fh, self._buf)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def flush(self):
+        """Write all buffered entries to the metrics file"""
+        _write_lines(self._fh, self._buf)
+
+    def close(self):
+        """Flush pending entries and close the metrics file"""
+        self._finalizer()
+
     def log_scraping_session(
         self,
         source_url: str,
@@ -56,7 +132,7 @@ class MetricsCollector:
             metadata: Additional metadata dictionary
         """
         entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp_ns": time.time_ns(),
             "event_type": "scraping_session",
             "source_url": source_url,
             "scraping_method": scraping_method,
@@ -92,7 +168,7 @@ class MetricsCollector:
             recommended_strategy: "api" or "browser"
         """
         entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp_ns": time.time_ns(),
             "event_type": "investigation",
             "target_url": target_url,
             "duration_seconds": round(duration_seconds, 2),
@@ -123,7 +199,7 @@ class MetricsCollector:
             field_completeness: Completeness percentages per field
         """
         entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp_ns": time.time_ns(),
             "event_type": "validation",
             "items_file": items_file,
             "total_items": total_items,
@@ -149,7 +225,7 @@ class MetricsCollector:
             context: Additional context dictionary
         """
         entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp_ns": time.time_ns(),
             "event_type": "error",
             "error_type": error_type,
             "error_message": error_message,
@@ -157,16 +233,23 @@ class MetricsCollector:
         }
 
         self._append_entry(entry)
+        # Errors are flushed immediately so they survive a crash
+        self.flush()
 
     def _append_entry(self, entry: Dict):
         """
-        Append a metrics entry to the JSONL file
+        Queue a metrics entry for the JSONL file (written on flush)
+
+        The ISO ``timestamp`` is derived from ``timestamp_ns`` here, once,
+        rather than by each logger.
 
         Args:
             entry: Metrics dictionary
         """
-        with open(self.metrics_file, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        entry["timestamp"] = _iso_from_ns(entry["timestamp_ns"])
+        self._buf.append(_dumpb(entry) + b"\n")
+        if len(self._buf) >= self._buf_max:
+            self.flush()
 
 
 def main():
@@ -231,6 +314,7 @@ def main():
                 pagination_type=args.pagination,
                 errors=args.errors
             )
+            collector.close()  # Write now so failures are reported below
             print("✓ Scraping metrics logged")
 
         elif args.command == "investigation":
@@ -242,6 +326,7 @@ def main():
                 confidence_score=args.confidence_score,
                 recommended_strategy=args.recommended_strategy
             )
+            collector.close()
             print("✓ Investigation metrics logged")
 
         elif args.command == "validation":
@@ -253,6 +338,7 @@ def main():
                 quality_score=args.quality_score,
                 field_completeness={"title": 100, "price": 100, "image_urls": 100, "description": 100}
             )
+            collector.close()
             print("✓ Validation metrics logged")
 
         elif args.command == "error":
@@ -260,6 +346,7 @@ def main():
                 error_type=args.error_type,
                 error_message=args.error_message
             )
+            collector.close()
             print("✓ Error metrics logged")
 
     except Exception as e:
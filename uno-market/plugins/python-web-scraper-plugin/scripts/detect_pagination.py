@@ -6,11 +6,17 @@ Implements T027 [US1] - Pagination detection using Playwright
 """
 
 import asyncio
+import copy
 import json
+import logging
+import re
 import sys
-from datetime import datetime
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse, urlsplit
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -23,27 +29,271 @@ except RuntimeError as e:
     print(f"ERROR: {e}", file=sys.stderr)
     sys.exit(1)
 
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import Browser, async_playwright, TimeoutError as PlaywrightTimeoutError
 from models import PaginationType, ConfidenceLevel, PaginationStrategy, ImplementationDetails, PaginationSelectors
 
+try:
+    import orjson
+except ImportError:  # Optional speedup - fall back to the stdlib codec
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # Optional speedup - fall back to the stdlib event loop
+    uvloop = None
+
+log = logging.getLogger("pagination")
+
 # Constants
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 TIMEOUT = 30000  # 30 seconds
 SCROLL_WAIT = 2000  # 2 seconds
+SCROLL_SETTLE = 200  # Quiet period after new items appear before counting them
+DEFAULT_ITEM_CONTAINER = "article"
+BATCH_CONCURRENCY = 8
+NETWORK_IDLE_CAP = 5000  # Longest wait for late XHR-rendered listings after DOMContentLoaded
+DETECTION_CACHE_SIZE = 256
+DETECTION_CACHE_TTL = 7 * 24 * 3600  # Seconds before a cached strategy is detected again
+# Detection needs only the DOM and response events; skip Chromium's background
+# services and per-site process isolation
+BROWSER_ARGS = [
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-extensions",
+    "--no-first-run",
+    "--disable-default-apps",
+    "--disable-features=IsolateOrigins,site-per-process"
+]
+# Service workers are blocked so every API call reaches the response listener
+CONTEXT_OPTIONS = {
+    "user_agent": USER_AGENT,
+    "bypass_csp": True,
+    "service_workers": "block",
+    "viewport": {"width": 1280, "height": 800}
+}
+DETECTION_CACHE_FILE = Path.home() / ".cache" / "uno-market" / "pagination.json"
+
+# Detection needs DOM structure and XHR/fetch traffic, never these payloads.
+# Stylesheets still load: visibility checks depend on them.
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+# URL pagination: query parameters in priority order, then /page/N/ paths
+_PAGE_PARAMS = ("page", "p", "pg", "offset", "start")
+_PAGE_PARAM_SET = frozenset(_PAGE_PARAMS)
+_PAGE_PATH_RE = re.compile(r'/page/(\d+)/')
+
+# API pagination: a pagination parameter key in the query string of an XHR/fetch response,
+# optionally with a JSON:API style bracket suffix (page[number]=, page%5Bsize%5D=)
+_API_PAGINATION_PARAMS = frozenset({"page", "offset", "limit", "cursor", "after", "before"})
+_API_PARAM_RE = re.compile(
+    r'[?&](%s)(?:\[[^\]&=]*\]|%%5B[^&=]*?%%5D)?=' % "|".join(sorted(_API_PAGINATION_PARAMS)),
+    re.I
+)
+_API_RESOURCE_TYPES = frozenset({"xhr", "fetch"})
+
+# Detected strategies by URL template, least recently used first. Entries are
+# {"stored_at": epoch seconds, "strategy": template-level strategy dict}.
+_DETECTION_CACHE: "OrderedDict[str, Dict]" = OrderedDict()
+_CACHED_STRATEGY_NOTE = (
+    "Strategy reused from an earlier detection on the same URL template; "
+    "page counts were not measured for this page."
+)
+
+# Common load more button patterns
+_LOAD_MORE_PATTERNS: Tuple[str, ...] = (
+    "text=/load more/i",
+    "text=/show more/i",
+    "text=/view more/i",
+    ".load-more",
+    "#load-more",
+    "[data-action='load-more']",
+    "button:has-text('Load More')",
+    "a:has-text('Load More')"
+)
+
+# Common pagination patterns
+_NEXT_BUTTON_PATTERNS: Tuple[str, ...] = (
+    ".pagination a.next",
+    ".pagination a:has-text('Next')",
+    "a[aria-label*='next']",
+    "a[rel='next']",
+    "button:has-text('Next')",
+    ".pager .next"
+)
+_PAGE_LINKS_SELECTOR = ".pagination a, .pager a"
+
+# Common item container patterns (plain CSS only)
+_ITEM_CONTAINER_PATTERNS: Tuple[str, ...] = (
+    ".product-item",
+    ".product-card",
+    ".product",
+    ".item",
+    ".listing",
+    ".result",
+    "article",
+    "[data-product]",
+    "[data-item]"
+)
+
+# Elements considered for Playwright ``text=`` selectors (script/style text never renders)
+_TEXT_CANDIDATES_CSS = "body *:not(script):not(style):not(template):not(noscript)"
+_TEXT_SELECTOR_RE = re.compile(r'^text=/(.*)/([a-z]*)$')
+_HAS_TEXT_RE = re.compile(r"^(.*):has-text\('(.*)'\)$")
+_JS_REGEX_SPECIAL_RE = re.compile(r'[.*+?^${}()|[\]\\/]')
+
+# Optionally scrolls to the bottom, then resolves once new items stop arriving
+# (or at the cap). Returns [initial_count, new_count]; a null initial count is
+# measured before scrolling.
+_WAIT_FOR_NEW_ITEMS_JS = """
+async ([selector, initial, scroll, timeout, settle]) => {
+    const count = () => document.querySelectorAll(selector).length;
+    if (initial === null) {
+        initial = count();
+    }
+    if (scroll) {
+        window.scrollTo(0, document.body.scrollHeight);
+    }
+    await new Promise((resolve) => {
+        let settleTimer = null;
+        const done = () => {
+            observer.disconnect();
+            clearTimeout(capTimer);
+            clearTimeout(settleTimer);
+            resolve();
+        };
+        const check = () => {
+            if (count() > initial) {
+                clearTimeout(settleTimer);
+                settleTimer = setTimeout(done, settle);
+            }
+        };
+        const observer = new MutationObserver(check);
+        observer.observe(document.body, {childList: true, subtree: true});
+        const capTimer = setTimeout(done, timeout);
+        // Items may already have landed before the observer was attached
+        check();
+    });
+    return [initial, count()];
+}
+"""
+
+_COUNT_SELECTORS_JS = "(selectors) => selectors.map((s) => document.querySelectorAll(s).length)"
+
+# Returns the index of the first probe (from ``start``) whose first match is
+# visible, or -1, in one round-trip. Each probe is a CSS selector with an
+# optional text regex; like Playwright's ``.first``, visibility is that of the
+# first match. Text matches keep only the innermost matching elements.
+_FIRST_VISIBLE_JS = """
+([probes, start]) => {
+    for (let i = start; i < probes.length; i++) {
+        const probe = probes[i];
+        let elements;
+        try {
+            elements = Array.from(document.querySelectorAll(probe.css));
+        } catch (e) {
+            continue;
+        }
+        if (probe.text !== null) {
+            const re = new RegExp(probe.text, probe.flags);
+            elements = elements.filter((el) =>
+                re.test(el.textContent) &&
+                !Array.from(el.children).some((child) => re.test(child.textContent))
+            );
+        }
+        const first = elements[0];
+        if (first !== undefined &&
+                first.getClientRects().length > 0 &&
+                window.getComputedStyle(first).visibility !== "hidden") {
+            return i;
+        }
+    }
+    return -1;
+}
+"""
 
+# First visible next button plus the numeric page links, in one round-trip.
+# Returns [probe index, page numbers] or null when no next button is visible.
+_NEXT_BUTTON_JS = """
+([probes, pageLinks]) => {
+    const index = (%s)([probes, 0]);
+    if (index < 0) {
+        return null;
+    }
+    const pages = Array.from(document.querySelectorAll(pageLinks))
+        .map((a) => a.textContent.trim())
+        .filter((text) => /^\\d+$/.test(text))
+        .map(Number);
+    return [index, pages];
+}
+""" % _FIRST_VISIBLE_JS.strip()
 
-async def test_infinite_scroll(page, item_selector: str) -> Optional[Dict]:
-    """Test for infinite scroll pagination"""
+
+async def _block_heavy_resources(route) -> None:
+    """Route handler that aborts image, media and font requests"""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def load_page(page, url: str, timeout: int) -> None:
+    """Navigate and wait for the DOM, then briefly for network quiet
+
+    Waiting for full ``networkidle`` can take the whole timeout on ad-heavy
+    sites; the idle wait is capped instead so JS-rendered items still land.
+    """
+    await page.goto(url, timeout=timeout, wait_until="domcontentloaded")
     try:
-        # Get initial item count
-        initial_count = await page.locator(item_selector).count()
+        await page.wait_for_load_state("networkidle", timeout=min(timeout, NETWORK_IDLE_CAP))
+    except PlaywrightTimeoutError:
+        pass
+
+
+def _dumpb_pretty(obj) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def _to_probe(pattern: str) -> Dict:
+    """Translate a Playwright selector into a CSS selector plus optional text regex"""
+    text_match = _TEXT_SELECTOR_RE.match(pattern)
+    if text_match:
+        return {"selector": pattern, "css": _TEXT_CANDIDATES_CSS,
+                "text": text_match.group(1), "flags": text_match.group(2)}
 
-        # Scroll to bottom
-        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        await page.wait_for_timeout(SCROLL_WAIT)
+    has_text_match = _HAS_TEXT_RE.match(pattern)
+    if has_text_match:
+        # :has-text() is a case-insensitive substring match
+        text = _JS_REGEX_SPECIAL_RE.sub(lambda m: "\\" + m.group(0), has_text_match.group(2))
+        return {"selector": pattern, "css": has_text_match.group(1) or "*",
+                "text": text, "flags": "i"}
 
-        # Check if new items loaded
-        new_count = await page.locator(item_selector).count()
+    return {"selector": pattern, "css": pattern, "text": None, "flags": ""}
+
+
+@lru_cache(maxsize=32)
+def _compile_probes(patterns: Tuple[str, ...]) -> List[Dict]:
+    return [_to_probe(pattern) for pattern in patterns]
+
+
+async def find_first_visible(page, patterns: Tuple[str, ...], start: int = 0) -> int:
+    """Return the index of the first pattern (from ``start``) with a visible match, or -1
+
+    Later patterns are never evaluated once one is visible.
+    """
+    return await page.evaluate(_FIRST_VISIBLE_JS, [_compile_probes(patterns), start])
+
+
+async def test_infinite_scroll(page, item_selector: str) -> Optional[Dict]:
+    """Test for infinite scroll pagination"""
+    try:
+        # Count, scroll and wait for new items in a single round-trip
+        initial_count, new_count = await page.evaluate(
+            _WAIT_FOR_NEW_ITEMS_JS, [item_selector, None, True, SCROLL_WAIT, SCROLL_SETTLE]
+        )
 
         if new_count > initial_count:
             items_loaded = new_count - initial_count
@@ -59,123 +309,105 @@ async def test_infinite_scroll(page, item_selector: str) -> Optional[Dict]:
                 }
             }
     except Exception as e:
-        print(f"Infinite scroll test failed: {e}", file=sys.stderr)
+        log.warning("Infinite scroll test failed: %s", e)
 
     return None
 
 
 async def test_load_more_button(page, item_selector: str) -> Optional[Dict]:
     """Test for load more button pagination"""
-    # Common load more button patterns
-    patterns = [
-        "text=/load more/i",
-        "text=/show more/i",
-        "text=/view more/i",
-        ".load-more",
-        "#load-more",
-        "[data-action='load-more']",
-        "button:has-text('Load More')",
-        "a:has-text('Load More')"
-    ]
-
-    for pattern in patterns:
+    start = 0
+    while True:
         try:
-            button = page.locator(pattern).first
-
-            if await button.is_visible(timeout=1000):
-                # Get initial item count
-                initial_count = await page.locator(item_selector).count()
-
-                # Click button
-                await button.click()
-                await page.wait_for_timeout(SCROLL_WAIT)
-
-                # Check if new items loaded
-                new_count = await page.locator(item_selector).count()
-
-                if new_count > initial_count:
-                    return {
-                        "type": PaginationType.LOAD_MORE,
-                        "confidence": ConfidenceLevel.HIGH,
-                        "button_selector": pattern,
-                        "items_loaded": new_count - initial_count,
-                        "implementation": {
-                            "end_condition": "button_not_visible"
-                        }
-                    }
-        except Exception:
-            continue
-
-    return None
-
+            index = await find_first_visible(page, _LOAD_MORE_PATTERNS, start)
+        except Exception as e:
+            log.warning("Load more probe failed: %s", e)
+            return None
+        if index < 0:
+            return None
 
-async def test_traditional_pagination(page) -> Optional[Dict]:
-    """Test for traditional page number pagination"""
-    # Common pagination patterns
-    next_button_patterns = [
-        ".pagination a.next",
-        ".pagination a:has-text('Next')",
-        "a[aria-label*='next']",
-        "a[rel='next']",
-        "button:has-text('Next')",
-        ".pager .next"
-    ]
-
-    for pattern in next_button_patterns:
+        pattern = _LOAD_MORE_PATTERNS[index]
         try:
-            next_button = page.locator(pattern).first
+            # Get initial item count
+            initial_count = await page.locator(item_selector).count()
 
-            if await next_button.is_visible(timeout=1000):
-                # Check for page numbers
-                page_numbers = await page.locator(".pagination a, .pager a").all_text_contents()
-                numeric_pages = [p for p in page_numbers if p.strip().isdigit()]
+            # Click button
+            await page.locator(pattern).first.click()
 
-                # Get current URL
-                current_url = page.url
+            # Wait for new items (capped at SCROLL_WAIT) and count them
+            _, new_count = await page.evaluate(
+                _WAIT_FOR_NEW_ITEMS_JS, [item_selector, initial_count, False, SCROLL_WAIT, SCROLL_SETTLE]
+            )
 
+            if new_count > initial_count:
                 return {
-                    "type": PaginationType.TRADITIONAL,
+                    "type": PaginationType.LOAD_MORE,
                     "confidence": ConfidenceLevel.HIGH,
-                    "next_button_selector": pattern,
-                    "page_count": max([int(p) for p in numeric_pages]) if numeric_pages else None,
+                    "button_selector": pattern,
+                    "items_loaded": new_count - initial_count,
                     "implementation": {
-                        "end_condition": "next_button_disabled"
+                        "end_condition": "button_not_visible"
                     }
                 }
         except Exception:
-            continue
+            pass
 
-    return None
+        # Clicking did not load items; try the next visible pattern
+        start = index + 1
 
 
-async def test_api_pagination(page) -> Optional[Dict]:
-    """Test for API-based pagination"""
-    api_requests = []
+async def test_traditional_pagination(page) -> Optional[Dict]:
+    """Test for traditional page number pagination"""
+    try:
+        hit = await page.evaluate(
+            _NEXT_BUTTON_JS, [_compile_probes(_NEXT_BUTTON_PATTERNS), _PAGE_LINKS_SELECTOR]
+        )
+    except Exception as e:
+        log.warning("Traditional pagination probe failed: %s", e)
+        return None
+    if hit is None:
+        return None
+
+    index, page_numbers = hit
+    return {
+        "type": PaginationType.TRADITIONAL,
+        "confidence": ConfidenceLevel.HIGH,
+        "next_button_selector": _NEXT_BUTTON_PATTERNS[index],
+        "page_count": max(page_numbers) if page_numbers else None,
+        "implementation": {
+            "end_condition": "next_button_disabled"
+        }
+    }
 
+
+def make_api_response_handler(api_requests: List[Dict]):
+    """Build a response listener that records JSON responses with pagination params"""
     async def handle_response(response):
         """Capture API responses"""
+        if response.request.resource_type not in _API_RESOURCE_TYPES:
+            return
+
         content_type = response.headers.get("content-type", "")
         if "application/json" in content_type:
             url = response.url
 
             # Check for pagination parameters
-            pagination_params = ["page", "offset", "limit", "cursor", "after", "before"]
-            if any(param in url for param in pagination_params):
+            if _API_PARAM_RE.search(url):
                 api_requests.append({
                     "url": url,
                     "status": response.status
                 })
 
-    # Listen for responses
-    page.on("response", handle_response)
+    return handle_response
 
-    # Trigger some interaction to capture API calls
-    try:
-        await page.evaluate("window.scrollTo(0, 100)")
-        await page.wait_for_timeout(1000)
-    except Exception:
-        pass
 
+def test_api_pagination(api_requests: List[Dict]) -> Optional[Dict]:
+    """Test for API-based pagination
+
+    Args:
+        api_requests: Responses captured by a make_api_response_handler listener
+            while the page was being scrolled
+    """
     if api_requests:
         return {
             "type": PaginationType.API_PAGINATION,
@@ -189,272 +421,490 @@ async def test_api_pagination(page) -> Optional[Dict]:
     return None
 
 
-async def test_url_pagination(page) -> Optional[Dict]:
-    """Test for URL-based pagination (page numbers in URL)"""
-    import re
-    from urllib.parse import urlparse, parse_qs
-
-    current_url = page.url
-    parsed_url = urlparse(current_url)
-    query_params = parse_qs(parsed_url.query)
-
-    # Common URL pagination patterns
-    url_patterns = {
-        "page": ["page", "p", "pg"],
-        "offset": ["offset", "start"],
-        "path": r'/page/(\d+)/',  # e.g., /page/2/
-    }
+@lru_cache(maxsize=256)
+def _parse_url(url: str):
+    """Parse a URL and its query string (memoized for batch runs)"""
+    parsed_url = urlparse(url)
+    return parsed_url, parse_qs(parsed_url.query)
 
-    # Check query parameters for page numbers
-    for param_type, param_names in url_patterns.items():
-        if param_type == "path":
-            # Check if URL path contains page numbers
-            path_match = re.search(param_names, parsed_url.path)
-            if path_match:
-                page_num = int(path_match.group(1))
-                return {
-                    "type": PaginationType.TRADITIONAL,
-                    "confidence": ConfidenceLevel.HIGH,
-                    "url_pattern": "path_based",
-                    "current_page": page_num,
-                    "implementation": {
-                        "url_template": current_url.replace(f"/page/{page_num}/", "/page/{page}/"),
-                        "end_condition": "404_or_empty_items"
-                    }
-                }
-        else:
-            # Check query parameters
-            for param_name in param_names:
-                if param_name in query_params:
-                    try:
-                        page_value = int(query_params[param_name][0])
-                        return {
-                            "type": PaginationType.TRADITIONAL,
-                            "confidence": ConfidenceLevel.HIGH,
-                            "url_pattern": "query_param",
-                            "param_name": param_name,
-                            "current_page": page_value,
-                            "implementation": {
-                                "pagination_param": param_name,
-                                "end_condition": "404_or_empty_items"
-                            }
+
+def quick_url_check(current_url: str) -> Optional[Dict]:
+    """Detect URL-based pagination (page numbers in URL) without loading the page"""
+    parsed_url, query_params = _parse_url(current_url)
+
+    # Check query parameters for page numbers, in priority order
+    if not _PAGE_PARAM_SET.isdisjoint(query_params):
+        for param_name in _PAGE_PARAMS:
+            if param_name in query_params:
+                try:
+                    page_value = int(query_params[param_name][0])
+                    return {
+                        "type": PaginationType.TRADITIONAL,
+                        "confidence": ConfidenceLevel.HIGH,
+                        "url_pattern": "query_param",
+                        "param_name": param_name,
+                        "current_page": page_value,
+                        "implementation": {
+                            "pagination_param": param_name,
+                            "end_condition": "404_or_empty_items"
                         }
-                    except (ValueError, IndexError):
-                        continue
+                    }
+                except (ValueError, IndexError):
+                    continue
+
+    # Check if URL path contains page numbers (e.g., /page/2/)
+    path_match = _PAGE_PATH_RE.search(parsed_url.path)
+    if path_match:
+        page_num = int(path_match.group(1))
+        return {
+            "type": PaginationType.TRADITIONAL,
+            "confidence": ConfidenceLevel.HIGH,
+            "url_pattern": "path_based",
+            "current_page": page_num,
+            "implementation": {
+                "url_template": current_url.replace(f"/page/{page_num}/", "/page/{page}/"),
+                "end_condition": "404_or_empty_items"
+            }
+        }
 
     return None
 
 
-async def detect_item_container(page) -> str:
-    """Detect the most likely item container selector"""
-    # Common item container patterns
-    patterns = [
-        ".product-item",
-        ".product-card",
-        ".product",
-        ".item",
-        ".listing",
-        ".result",
-        "article",
-        "[data-product]",
-        "[data-item]"
-    ]
-
-    best_selector = None
-    best_count = 0
-
-    for pattern in patterns:
-        try:
-            count = await page.locator(pattern).count()
-            if count >= 3 and count > best_count:  # At least 3 items
-                best_selector = pattern
-                best_count = count
-        except Exception:
-            continue
+async def test_url_pagination(page) -> Optional[Dict]:
+    """Test for URL-based pagination on the loaded page's (post-redirect) URL"""
+    return quick_url_check(page.url)
+
+
+async def detect_item_container(page) -> Tuple[str, int]:
+    """Detect the most likely item container selector
+
+    Returns:
+        tuple: (selector, number of matching elements)
+    """
+    # Plain CSS only, so every count comes from one querySelectorAll pass
+    try:
+        counts = await page.evaluate(_COUNT_SELECTORS_JS, _ITEM_CONTAINER_PATTERNS)
+    except Exception as e:
+        log.warning("Item container probe failed: %s", e)
+        counts = [0] * len(_ITEM_CONTAINER_PATTERNS)
+
+    # First pattern with the highest count wins; at least 3 items required
+    best_selector, best_count = max(
+        zip(_ITEM_CONTAINER_PATTERNS, counts),
+        key=lambda candidate: candidate[1] if candidate[1] >= 3 else -1
+    )
+    if best_count < 3:
+        return DEFAULT_ITEM_CONTAINER, counts[_ITEM_CONTAINER_PATTERNS.index(DEFAULT_ITEM_CONTAINER)]  # Fallback
 
-    return best_selector or "article"  # Fallback
+    return best_selector, best_count
 
 
-async def detect_pagination(target_url: str, timeout: int = TIMEOUT, headless: bool = True) -> Dict:
+async def _test_load_more_on_new_page(context, target_url: str, item_selector: str, timeout: int) -> Optional[Dict]:
+    """Run the load-more test on its own page so it can overlap the scroll test"""
+    page = await context.new_page()
+    try:
+        await load_page(page, target_url, timeout)
+        return await test_load_more_button(page, item_selector)
+    except Exception as e:
+        log.warning("Load more test failed: %s", e)
+        return None
+    finally:
+        await page.close()
+
+
+def _build_strategy(
+    item_selector: str,
+    total_items: int,
+    scroll_result: Optional[Dict],
+    load_more_result: Optional[Dict],
+    traditional_result: Optional[Dict],
+    url_result: Optional[Dict],
+    api_result: Optional[Dict]
+) -> Dict:
+    """Pick the highest-priority detection and build its PaginationStrategy dict"""
+    # Priority order: infinite scroll, load more, traditional, URL-based, API
+    if scroll_result:
+        log.info("✓ Infinite scroll detected")
+
+        strategy = PaginationStrategy(
+            pagination_type=scroll_result["type"],
+            implementation_details=ImplementationDetails(
+                scroll_strategy=scroll_result["implementation"]["scroll_strategy"],
+                wait_time_ms=scroll_result["implementation"]["wait_time_ms"],
+                end_condition=scroll_result["implementation"]["end_condition"],
+                items_per_page=scroll_result.get("items_loaded")
+            ),
+            selectors=PaginationSelectors(
+                item_container=item_selector
+            ),
+            confidence=scroll_result["confidence"],
+            detected_page_count=None,
+            notes=f"Infinite scroll detected. Approximately {scroll_result.get('items_loaded')} items load per scroll."
+        )
+        return strategy.model_dump()
+
+    if load_more_result:
+        log.info("✓ Load more button detected: %s", load_more_result["button_selector"])
+
+        strategy = PaginationStrategy(
+            pagination_type=load_more_result["type"],
+            implementation_details=ImplementationDetails(
+                wait_time_ms=SCROLL_WAIT,
+                end_condition=load_more_result["implementation"]["end_condition"],
+                items_per_page=load_more_result.get("items_loaded")
+            ),
+            selectors=PaginationSelectors(
+                load_more_button=load_more_result["button_selector"],
+                item_container=item_selector
+            ),
+            confidence=load_more_result["confidence"],
+            detected_page_count=None,
+            notes=f"Load more button found. Selector: {load_more_result['button_selector']}"
+        )
+        return strategy.model_dump()
+
+    if traditional_result:
+        log.info("✓ Traditional pagination detected")
+
+        strategy = PaginationStrategy(
+            pagination_type=traditional_result["type"],
+            implementation_details=ImplementationDetails(
+                wait_time_ms=SCROLL_WAIT,
+                end_condition=traditional_result["implementation"]["end_condition"],
+                max_pages=traditional_result.get("page_count"),
+                items_per_page=total_items
+            ),
+            selectors=PaginationSelectors(
+                next_button=traditional_result["next_button_selector"],
+                item_container=item_selector
+            ),
+            confidence=traditional_result["confidence"],
+            detected_page_count=traditional_result.get("page_count"),
+            notes=f"Traditional pagination with next button. Selector: {traditional_result['next_button_selector']}"
+        )
+        return strategy.model_dump()
+
+    if url_result:
+        log.info("✓ URL-based pagination detected (%s)", url_result["url_pattern"])
+
+        strategy = PaginationStrategy(
+            pagination_type=url_result["type"],
+            implementation_details=ImplementationDetails(
+                wait_time_ms=SCROLL_WAIT,
+                end_condition=url_result["implementation"]["end_condition"],
+                pagination_param=url_result["implementation"].get("pagination_param")
+            ),
+            selectors=PaginationSelectors(
+                item_container=item_selector
+            ),
+            confidence=url_result["confidence"],
+            detected_page_count=None,
+            notes=f"URL-based pagination. Pattern: {url_result['url_pattern']}, Current page: {url_result.get('current_page', 'unknown')}"
+        )
+        return strategy.model_dump()
+
+    if api_result:
+        log.info("✓ API pagination detected")
+
+        strategy = PaginationStrategy(
+            pagination_type=api_result["type"],
+            implementation_details=ImplementationDetails(
+                wait_time_ms=0,  # No wait needed for API
+                end_condition=api_result["implementation"]["end_condition"]
+            ),
+            selectors=PaginationSelectors(
+                item_container=item_selector
+            ),
+            confidence=api_result["confidence"],
+            detected_page_count=None,
+            notes=f"API pagination detected. URLs: {', '.join(api_result['api_urls'][:2])}"
+        )
+        return strategy.model_dump()
+
+    # No pagination detected
+    log.info("✗ No pagination detected (single page)")
+
+    strategy = PaginationStrategy(
+        pagination_type=PaginationType.NONE,
+        implementation_details=ImplementationDetails(
+            wait_time_ms=0,
+            end_condition="single_page"
+        ),
+        selectors=PaginationSelectors(
+            item_container=item_selector
+        ),
+        confidence=ConfidenceLevel.MEDIUM,
+        detected_page_count=1,
+        notes="No pagination controls found. This appears to be a single-page listing."
+    )
+    return strategy.model_dump()
+
+
+def _cache_key(url: str) -> str:
+    """Reduce a URL to scheme, host and path template
+
+    Numeric path segments become ``{n}`` and the query string is dropped, so
+    ``/page/2/`` and ``/page/9/`` share a key while ``/products`` and
+    ``/products/123`` do not.
+    """
+    parts = urlsplit(url)
+    segments = ["{n}" if segment.isdigit() else segment for segment in parts.path.split("/") if segment]
+    return f"{parts.scheme}://{parts.netloc.lower()}/" + "/".join(segments)
+
+
+def _template_strategy(strategy: Dict) -> Dict:
+    """Copy a strategy without the counts and notes measured on one listing"""
+    template = copy.deepcopy(strategy)
+    template["detected_page_count"] = None
+    template["notes"] = None
+    details = template.get("implementation_details")
+    if details:
+        details["max_pages"] = None
+        details["items_per_page"] = None
+    return template
+
+
+def _cache_insert(key: str, entry: Dict) -> None:
+    _DETECTION_CACHE[key] = entry
+    _DETECTION_CACHE.move_to_end(key)
+    while len(_DETECTION_CACHE) > DETECTION_CACHE_SIZE:
+        _DETECTION_CACHE.popitem(last=False)
+
+
+def _cache_get(key: str) -> Optional[Dict]:
+    entry = _DETECTION_CACHE.get(key)
+    if entry is None:
+        return None
+    if time.time() - entry["stored_at"] > DETECTION_CACHE_TTL:
+        del _DETECTION_CACHE[key]
+        return None
+    _DETECTION_CACHE.move_to_end(key)
+    strategy = copy.deepcopy(entry["strategy"])
+    strategy["notes"] = _CACHED_STRATEGY_NOTE
+    return strategy
+
+
+def _cache_put(key: str, strategy: Dict) -> None:
+    _cache_insert(key, {"stored_at": time.time(), "strategy": _template_strategy(strategy)})
+
+
+def load_detection_cache(path: Path = DETECTION_CACHE_FILE) -> None:
+    """Load strategies saved by a previous run; a missing or corrupt file is ignored"""
+    try:
+        with open(path, "r") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return
+    if isinstance(saved, dict):
+        for key, entry in saved.items():
+            # Entries without a timestamp predate expiry and are dropped
+            if isinstance(entry, dict) and isinstance(entry.get("stored_at"), (int, float)) and "strategy" in entry:
+                _cache_insert(key, entry)
+
+
+def save_detection_cache(path: Path = DETECTION_CACHE_FILE) -> None:
+    """Persist the cached strategies for the next run"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(_DETECTION_CACHE, f)
+    except OSError as e:
+        log.warning("Could not save detection cache: %s", e)
+
+
+async def launch_browser(playwright, headless: bool = True) -> Browser:
+    """Launch the Chromium instance detection pages run in"""
+    return await playwright.chromium.launch(headless=headless, args=BROWSER_ARGS)
+
+
+async def detect_pagination(
+    target_url: str,
+    timeout: int = TIMEOUT,
+    headless: bool = True,
+    browser: Optional[Browser] = None,
+    use_cache: bool = True
+) -> Dict:
     """
     Main pagination detection function
 
+    All detectors run on a single page load; only the load-more test, which
+    clicks and so would disturb the scroll test, gets a second page. The
+    highest-priority positive result wins.
+
     Args:
         target_url: URL to analyze
         timeout: Page load timeout in milliseconds
         headless: Run browser in headless mode
+        browser: Shared browser; a private one is launched when omitted
+        use_cache: Reuse a strategy detected for the same URL template
 
     Returns:
         PaginationStrategy dict
     """
-    start_time = datetime.utcnow()
+    # A page number already in the URL settles it without starting a browser;
+    # the item container is then the unverified default selector, so the
+    # strategy is only medium confidence
+    url_result = quick_url_check(target_url)
+    if url_result:
+        strategy = _build_strategy(
+            DEFAULT_ITEM_CONTAINER, 0, None, None, None,
+            {**url_result, "confidence": ConfidenceLevel.MEDIUM}, None
+        )
+        strategy["notes"] += (
+            ". Item container not verified: the page was not loaded, "
+            f"so the default '{DEFAULT_ITEM_CONTAINER}' selector is assumed."
+        )
+        return strategy
+
+    cache_key = _cache_key(target_url)
+    if use_cache:
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            log.info("Using cached strategy for %s", cache_key)
+            return cached
+
+    if browser is None:
+        async with async_playwright() as p:
+            try:
+                browser = await launch_browser(p, headless)
+            except Exception as e:
+                return {
+                    "error": "detection_failed",
+                    "message": str(e)
+                }
+            try:
+                return await detect_pagination(target_url, timeout, headless, browser, use_cache)
+            finally:
+                await browser.close()
 
-    async with async_playwright() as p:
-        try:
-            # Launch browser
-            browser = await p.chromium.launch(headless=headless)
-            context = await browser.new_context(user_agent=USER_AGENT)
-            page = await context.new_page()
+    # One context per URL keeps cookies and storage isolated on a shared browser
+    context = None
+    try:
+        context = await browser.new_context(**CONTEXT_OPTIONS)
+        await context.route("**/*", _block_heavy_resources)
+        page = await context.new_page()
 
-            # Navigate to target URL
-            await page.goto(target_url, timeout=timeout, wait_until="networkidle")
+        # Navigate to target URL
+        await load_page(page, target_url, timeout)
 
-            # Detect item container
-            item_selector = await detect_item_container(page)
-            total_items = await page.locator(item_selector).count()
+        # Detect item container
+        item_selector, total_items = await detect_item_container(page)
 
-            print(f"Detected item container: {item_selector} ({total_items} items)")
+        log.info("Detected item container: %s (%d items)", item_selector, total_items)
 
-            # Test pagination types in priority order
+        async def run_on_main_page():
+            # Read-only checks first, then the scroll test which mutates the page
+            url_result, traditional_result = await asyncio.gather(
+                test_url_pagination(page),
+                test_traditional_pagination(page)
+            )
 
-            # Test 1: Infinite scroll
+            # API calls fired by the scroll are harvested by the same listener,
+            # so API detection needs no scroll of its own
+            api_requests = []
+            page.on("response", make_api_response_handler(api_requests))
             scroll_result = await test_infinite_scroll(page, item_selector)
-            if scroll_result:
-                print("✓ Infinite scroll detected")
-
-                strategy = PaginationStrategy(
-                    pagination_type=scroll_result["type"],
-                    implementation_details=ImplementationDetails(
-                        scroll_strategy=scroll_result["implementation"]["scroll_strategy"],
-                        wait_time_ms=scroll_result["implementation"]["wait_time_ms"],
-                        end_condition=scroll_result["implementation"]["end_condition"],
-                        items_per_page=scroll_result.get("items_loaded")
-                    ),
-                    selectors=PaginationSelectors(
-                        item_container=item_selector
-                    ),
-                    confidence=scroll_result["confidence"],
-                    detected_page_count=None,
-                    notes=f"Infinite scroll detected. Approximately {scroll_result.get('items_loaded')} items load per scroll."
-                )
-
-                await browser.close()
-                return strategy.model_dump()
-
-            # Test 2: Load more button
-            load_more_result = await test_load_more_button(page, item_selector)
-            if load_more_result:
-                print(f"✓ Load more button detected: {load_more_result['button_selector']}")
-
-                strategy = PaginationStrategy(
-                    pagination_type=load_more_result["type"],
-                    implementation_details=ImplementationDetails(
-                        wait_time_ms=SCROLL_WAIT,
-                        end_condition=load_more_result["implementation"]["end_condition"],
-                        items_per_page=load_more_result.get("items_loaded")
-                    ),
-                    selectors=PaginationSelectors(
-                        load_more_button=load_more_result["button_selector"],
-                        item_container=item_selector
-                    ),
-                    confidence=load_more_result["confidence"],
-                    detected_page_count=None,
-                    notes=f"Load more button found. Selector: {load_more_result['button_selector']}"
-                )
+            api_result = test_api_pagination(api_requests)
+
+            return scroll_result, traditional_result, url_result, api_result
+
+        (scroll_result, traditional_result, url_result, api_result), load_more_result = await asyncio.gather(
+            run_on_main_page(),
+            _test_load_more_on_new_page(context, target_url, item_selector, timeout)
+        )
+
+        strategy = _build_strategy(
+            item_selector,
+            total_items,
+            scroll_result,
+            load_more_result,
+            traditional_result,
+            url_result,
+            api_result
+        )
+        if use_cache:
+            _cache_put(cache_key, strategy)
+        return strategy
+
+    except PlaywrightTimeoutError:
+        return {
+            "error": "timeout",
+            "message": f"Page failed to load within {timeout/1000} seconds"
+        }
+    except Exception as e:
+        return {
+            "error": "detection_failed",
+            "message": str(e)
+        }
+    finally:
+        if context is not None:
+            await context.close()
+
+
+async def detect_many(
+    urls: List[str],
+    timeout: int = TIMEOUT,
+    headless: bool = True,
+    concurrency: int = BATCH_CONCURRENCY,
+    use_cache: bool = True
+) -> List[Dict]:
+    """
+    Detect pagination for several URLs on one shared browser
 
-                await browser.close()
-                return strategy.model_dump()
-
-            # Test 3: Traditional pagination
-            traditional_result = await test_traditional_pagination(page)
-            if traditional_result:
-                print(f"✓ Traditional pagination detected")
-
-                strategy = PaginationStrategy(
-                    pagination_type=traditional_result["type"],
-                    implementation_details=ImplementationDetails(
-                        wait_time_ms=SCROLL_WAIT,
-                        end_condition=traditional_result["implementation"]["end_condition"],
-                        max_pages=traditional_result.get("page_count"),
-                        items_per_page=total_items
-                    ),
-                    selectors=PaginationSelectors(
-                        next_button=traditional_result["next_button_selector"],
-                        item_container=item_selector
-                    ),
-                    confidence=traditional_result["confidence"],
-                    detected_page_count=traditional_result.get("page_count"),
-                    notes=f"Traditional pagination with next button. Selector: {traditional_result['next_button_selector']}"
-                )
+    Args:
+        urls: URLs to analyze
+        timeout: Page load timeout in milliseconds
+        headless: Run browser in headless mode
+        concurrency: Maximum number of URLs analyzed at once
+        use_cache: Reuse strategies detected for the same URL template
 
-                await browser.close()
-                return strategy.model_dump()
-
-            # Test 4: URL-based pagination
-            url_result = await test_url_pagination(page)
-            if url_result:
-                print(f"✓ URL-based pagination detected ({url_result['url_pattern']})")
-
-                strategy = PaginationStrategy(
-                    pagination_type=url_result["type"],
-                    implementation_details=ImplementationDetails(
-                        wait_time_ms=SCROLL_WAIT,
-                        end_condition=url_result["implementation"]["end_condition"],
-                        pagination_param=url_result["implementation"].get("pagination_param")
-                    ),
-                    selectors=PaginationSelectors(
-                        item_container=item_selector
-                    ),
-                    confidence=url_result["confidence"],
-                    detected_page_count=None,
-                    notes=f"URL-based pagination. Pattern: {url_result['url_pattern']}, Current page: {url_result.get('current_page', 'unknown')}"
-                )
+    Returns:
+        PaginationStrategy (or error) dicts in input order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
 
-                await browser.close()
-                return strategy.model_dump()
-
-            # Test 5: API pagination
-            api_result = await test_api_pagination(page)
-            if api_result:
-                print("✓ API pagination detected")
-
-                strategy = PaginationStrategy(
-                    pagination_type=api_result["type"],
-                    implementation_details=ImplementationDetails(
-                        wait_time_ms=0,  # No wait needed for API
-                        end_condition=api_result["implementation"]["end_condition"]
-                    ),
-                    selectors=PaginationSelectors(
-                        item_container=item_selector
-                    ),
-                    confidence=api_result["confidence"],
-                    detected_page_count=None,
-                    notes=f"API pagination detected. URLs: {', '.join(api_result['api_urls'][:2])}"
-                )
+    async with async_playwright() as p:
+        try:
+            browser = await launch_browser(p, headless)
+        except Exception as e:
+            # Same error shape as single-URL mode, once per URL
+            return [
+                {"error": "detection_failed", "message": str(e)}
+                for _ in urls
+            ]
 
-                await browser.close()
-                return strategy.model_dump()
-
-            # No pagination detected
-            print("✗ No pagination detected (single page)")
-
-            strategy = PaginationStrategy(
-                pagination_type=PaginationType.NONE,
-                implementation_details=ImplementationDetails(
-                    wait_time_ms=0,
-                    end_condition="single_page"
-                ),
-                selectors=PaginationSelectors(
-                    item_container=item_selector
-                ),
-                confidence=ConfidenceLevel.MEDIUM,
-                detected_page_count=1,
-                notes="No pagination controls found. This appears to be a single-page listing."
-            )
+        async def run(url: str) -> Dict:
+            async with semaphore:
+                return await detect_pagination(url, timeout, headless, browser, use_cache)
 
+        try:
+            return await asyncio.gather(*(run(url) for url in urls))
+        finally:
             await browser.close()
-            return strategy.model_dump()
 
-        except PlaywrightTimeoutError:
-            return {
-                "error": "timeout",
-                "message": f"Page failed to load within {timeout/1000} seconds"
-            }
-        except Exception as e:
-            return {
-                "error": "detection_failed",
-                "message": str(e)
-            }
+
+async def _async_main(args, urls: Optional[List[str]], use_cache: bool) -> Dict:
+    """Run the CLI's detection on a single event loop
+
+    Returns:
+        The strategy dict, or strategies keyed by URL in batch mode
+    """
+    if urls is not None:
+        # Batch mode: one browser for all URLs, results keyed by URL
+        results = await detect_many(
+            urls,
+            timeout=args.timeout * 1000,
+            headless=args.headless,
+            use_cache=use_cache
+        )
+        return dict(zip(urls, results))
+
+    return await detect_pagination(
+        args.url,
+        timeout=args.timeout * 1000,
+        headless=args.headless,
+        use_cache=use_cache
+    )
 
 
 def main():
@@ -464,33 +914,58 @@ def main():
     parser = argparse.ArgumentParser(
         description="Detect pagination type and strategy for a URL"
     )
-    parser.add_argument("url", help="Target URL to analyze")
+    parser.add_argument("url", nargs="?", help="Target URL to analyze")
+    parser.add_argument("--urls-file", type=Path, help="Analyze every URL in a newline-delimited file")
     parser.add_argument("--timeout", type=int, default=30, help="Page load timeout in seconds")
     parser.add_argument("--headless", action="store_true", default=True, help="Run in headless mode")
     parser.add_argument("--output", type=Path, help="Save strategy to file")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the detection cache")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Log detection progress to stderr")
 
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
+    use_cache = not args.no_cache
 
-    # Run detection
-    result = asyncio.run(detect_pagination(
-        args.url,
-        timeout=args.timeout * 1000,
-        headless=args.headless
-    ))
+    if (args.url is None) == (args.urls_file is None):
+        parser.error("provide either a URL or --urls-file")
 
-    # Handle errors
-    if "error" in result:
-        print(json.dumps(result, indent=2), file=sys.stderr)
-        sys.exit(1)
+    if use_cache:
+        load_detection_cache()
 
-    # Output result
+    urls = None
+    if args.urls_file:
+        if not args.urls_file.exists():
+            print(f"Error: URLs file not found: {args.urls_file}", file=sys.stderr)
+            sys.exit(1)
+        with open(args.urls_file, "r") as f:
+            urls = [line.strip() for line in f if line.strip()]
+
+    # Run detection
+    run = uvloop.run if uvloop is not None else asyncio.run
+    result = run(_async_main(args, urls, use_cache))
+
+    if urls is not None:
+        failed = any("error" in r for r in result.values())
+    else:
+        # Handle errors
+        if "error" in result:
+            sys.stderr.flush()
+            sys.stderr.buffer.write(_dumpb_pretty(result) + b"\n")
+            sys.exit(1)
+        failed = False
+
+    if use_cache:
+        save_detection_cache()
+
+    # Output result, serialized once for both the file and stdout
+    payload = _dumpb_pretty(result)
     if args.output:
-        with open(args.output, "w") as f:
-            json.dump(result, f, indent=2)
-        print(f"Strategy saved to: {args.output}")
+        args.output.write_bytes(payload)
+        log.info("Strategy saved to: %s", args.output)
 
-    print(json.dumps(result, indent=2))
-    sys.exit(0)
+    sys.stdout.flush()
+    sys.stdout.buffer.write(payload + b"\n")
+    sys.exit(1 if failed else 0)
 
 
 if __name__ == "__main__":
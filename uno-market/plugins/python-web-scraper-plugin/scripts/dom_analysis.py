@@ -12,9 +12,9 @@ import sys
 from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import JSHandle, async_playwright, TimeoutError as PlaywrightTimeoutError
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -23,73 +23,306 @@ from models import DOMSelectorMap, FieldSelector, ConfidenceLevel
 # Constants
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 TIMEOUT = 30000  # 30 seconds
+CONTAINER_COUNT_ENOUGH = 50  # A corroborated container count this high ends the pattern scan
+ITEMS_WAIT_TIMEOUT = 15000  # Longest wait for the item grid after DOMContentLoaded
+LAZY_GRID_WAIT = 3000  # Extra settle time when no grid appeared in that window
+SAMPLE_SIZES = (3, 5, 8, 13)  # Sample growth while the best selector is ambiguous
+SETTLED_ACCURACY = 0.85  # Best-pattern accuracy at which the sample stops growing
+DEFAULT_SAMPLE_SIZE = SAMPLE_SIZES[-1]
+
+# DOM analysis reads structure, text and attribute values only; image src
+# attributes are still readable when the image bytes are never fetched
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+# Common item container patterns, most product-specific first
+_ITEM_CONTAINER_PATTERNS = (
+    "[data-product]", ".product-item", ".product-card", ".product",
+    "[data-item]", ".item", ".card", ".listing", ".result",
+    "article", ".entry", ".post"
+)
+
+# True once any container pattern matches at least 3 elements
+_ITEMS_RENDERED_JS = "(selectors) => selectors.some((selector) => document.querySelectorAll(selector).length >= 3)"
+
+# Selector confidence, as the 0-1 score reported in confidence_scores
+_CONF_SCORE = {ConfidenceLevel.HIGH: 1.0, ConfidenceLevel.MEDIUM: 0.85, ConfidenceLevel.LOW: 0.7}
+
+_HAS_TEXT_RE = re.compile(r"^(.*):has-text\('(.*)'\)$")
+_PRICE_NUM_RE = re.compile(r'\d+\.?\d*')
+_PRICE_CURRENCY_RE = re.compile(r'[$€£]\s*\d+')
+
+# Counts selectors in order in one round-trip; an invalid selector counts as 0.
+# Counting stops once the best count reaches ``enough`` and another candidate
+# with at least 3 items is within half of it: later, more generic patterns are
+# then unlikely to describe the items better.
+_COUNT_CONTAINERS_JS = """
+([selectors, enough]) => {
+    const counts = [];
+    const candidates = [];
+    for (const selector of selectors) {
+        let count = 0;
+        try {
+            count = document.querySelectorAll(selector).length;
+        } catch (e) {
+            // Invalid selector: no matches
+        }
+        counts.push(count);
+        if (count >= 3) {
+            candidates.push(count);
+            const best = Math.max(...candidates);
+            if (best >= enough && candidates.filter((c) => c * 2 >= best).length >= 2) {
+                break;
+            }
+        }
+    }
+    return counts;
+}
+"""
 
 
-async def find_item_containers(page) -> Dict[str, int]:
-    """Find repeating element patterns that likely represent items"""
-    # Common item container patterns
-    patterns = [
-        ".product-item", ".product-card", ".product",
-        ".item", ".card", ".listing", ".result",
-        "article", "[data-product]", "[data-item]",
-        ".entry", ".post"
-    ]
+# Counts, per probe, how many of the first ``size`` sampled containers have a
+# match passing the probe's check, in one round-trip. The check runs on the first match's text content
+# (or its ``attr`` attribute); ``source`` probes instead pass when any match
+# has a src/data-src. A value passes when it is non-empty, at least
+# ``minLength`` characters once trimmed, and matches one of ``regexes`` (if
+# any). Probes are taken in order and counting stops after the first one
+# that matches at least ``stopAt`` of the containers. Returns
+# [containers counted, count per probe].
+#
+# Each CSS pattern is resolved with one document-wide querySelectorAll and
+# bucketed into the containers it falls in. The buckets are cached on the
+# containers array, so a pattern shared by several fields is scanned once.
+_FIELD_MATCHES_JS = """
+([containers, probes, stopAt, size]) => {
+    const sampled = Math.min(size, containers.length);
+    const indexOf = new Map(containers.map((container, i) => [container, i]));
+    const matchesOf = (css) => {
+        let buckets = containers.matches.get(css);
+        if (buckets === undefined) {
+            buckets = containers.map(() => []);
+            let nodes = [];
+            try {
+                nodes = document.querySelectorAll(containers.selector + " " + css);
+            } catch (e) {
+                // Invalid selector: no matches
+            }
+            for (const node of nodes) {
+                for (let el = node.parentElement; el !== null; el = el.parentElement) {
+                    const i = indexOf.get(el);
+                    if (i !== undefined) {
+                        buckets[i].push(node);
+                    }
+                }
+            }
+            containers.matches.set(css, buckets);
+        }
+        return buckets;
+    };
+    const sourceOf = (el) => el.getAttribute("src") || el.getAttribute("data-src");
+    const counts = [];
+    for (const probe of probes) {
+        const regexes = probe.regexes.map((source) => new RegExp(source));
+        const passes = (value) => Boolean(value) &&
+            value.trim().length >= probe.minLength &&
+            (regexes.length === 0 || regexes.some((re) => re.test(value)));
+        let count = 0;
+        for (const bucket of matchesOf(probe.css).slice(0, sampled)) {
+            let elements = bucket;
+            if (probe.text !== null) {
+                elements = elements.filter((el) => el.textContent.toLowerCase().includes(probe.text));
+            }
+            if (probe.source) {
+                count += elements.some(sourceOf) ? 1 : 0;
+            } else if (elements.length > 0) {
+                const first = elements[0];
+                count += passes(probe.attr !== null ? first.getAttribute(probe.attr) : first.textContent) ? 1 : 0;
+            }
+        }
+        counts.push(count);
+        if (sampled > 0 && count / sampled >= stopAt) {
+            break;
+        }
+    }
+    return [sampled, counts];
+}
+"""
 
-    container_counts = {}
+# Resolves the sampled containers once; the array handle is shared by every
+# field probe and carries the per-pattern match cache. The same call installs
+# the field matcher as window.__unoProbe, so later probe calls only send their
+# arguments instead of re-sending and re-compiling the matcher source. It is
+# installed by evaluate rather than add_script_tag, which injects an inline
+# <script> that a page's Content-Security-Policy can block.
+_SAMPLE_CONTAINERS_JS = """
+([selector, sampleSize]) => {
+    window.__unoProbe = %s;
+    const containers = Array.from(document.querySelectorAll(selector)).slice(0, sampleSize);
+    containers.selector = selector;
+    containers.matches = new Map();
+    return containers;
+}
+""" % _FIELD_MATCHES_JS.strip()
+_FIELD_MATCHES_CALL_JS = "(args) => window.__unoProbe(args)"
+
+
+def _to_probe(
+    pattern: str,
+    attr: Optional[str] = None,
+    source: bool = False,
+    min_length: int = 0,
+    regexes: Tuple[re.Pattern, ...] = ()
+) -> Dict:
+    """Translate a selector pattern and its match check into an in-page probe
+
+    Playwright's ``:has-text('...')`` becomes a case-insensitive substring
+    filter on the CSS part.
+    """
+    probe = {"css": pattern, "text": None, "attr": attr, "source": source,
+             "minLength": min_length, "regexes": [regex.pattern for regex in regexes]}
+    has_text_match = _HAS_TEXT_RE.match(pattern)
+    if has_text_match:
+        probe["css"] = has_text_match.group(1) or "*"
+        probe["text"] = has_text_match.group(2).lower()
+    return probe
 
-    for pattern in patterns:
-        try:
-            count = await page.locator(pattern).count()
-            if count >= 3:  # Minimum 3 items to be considered
-                container_counts[pattern] = count
-        except Exception:
-            continue
 
-    return container_counts
+async def sample_containers(page, container_selector: str, sample_size: int) -> JSHandle:
+    """Resolve the first ``sample_size`` item containers into an in-page array handle"""
+    return await page.evaluate_handle(_SAMPLE_CONTAINERS_JS, [container_selector, sample_size])
 
 
-async def find_title_selector(page, container_selector: str, sample_size: int = 5) -> Optional[FieldSelector]:
-    """Find selector for title/name field"""
-    patterns = [
-        "h1", "h2", "h3", "h4",
-        ".title", ".name", ".product-title", ".product-name",
-        "[data-title]", "[data-name]"
-    ]
+async def count_field_matches(
+    page,
+    containers: JSHandle,
+    probes: List[Dict],
+    stop_at: float,
+    size: int
+) -> Tuple[int, List[int]]:
+    """Count how many of the first ``size`` sampled containers each probe matches, in one evaluate
 
-    containers = await page.locator(container_selector).all()
-    containers = containers[:sample_size]  # Limit sample size
+    Probes after the first one matching at least ``stop_at`` of the
+    containers are skipped.
 
+    Returns:
+        tuple: (number of containers counted, match count per evaluated probe)
+    """
+    checked, counts = await page.evaluate(_FIELD_MATCHES_CALL_JS, [containers, probes, stop_at, size])
+    return checked, counts
+
+
+def _sample_ladder(sample_size: int) -> Tuple[int, ...]:
+    """Sample sizes to try in turn, capped at ``sample_size``"""
+    return tuple(size for size in SAMPLE_SIZES if size < sample_size) + (sample_size,)
+
+
+async def select_pattern(
+    page,
+    containers: JSHandle,
+    sample_size: int,
+    patterns: List[str],
+    probes: List[Dict],
+    min_accuracy: float,
+    high_accuracy: float
+) -> Tuple[Optional[str], float]:
+    """Pick the earliest pattern with the highest accuracy of at least ``min_accuracy``
+
+    Starts on a small sample and grows it along SAMPLE_SIZES (up to
+    ``sample_size``) only while the best accuracy is below SETTLED_ACCURACY.
+
+    Returns:
+        tuple: (best pattern or None, its accuracy)
+    """
     best_selector = None
     best_accuracy = 0.0
 
-    for pattern in patterns:
-        matches = 0
-        total_checked = 0
-
-        for container in containers:
-            total_checked += 1
-            try:
-                elem = await container.query_selector(pattern)
-                if elem:
-                    text = await elem.text_content()
-                    if text and len(text.strip()) >= 5:  # Minimum length
-                        matches += 1
-            except Exception:
-                continue
-
-        if total_checked > 0:
-            accuracy = matches / total_checked
-            if accuracy > best_accuracy and accuracy >= 0.9:
-                best_accuracy = accuracy
-                best_selector = pattern
+    for size in _sample_ladder(sample_size):
+        total_checked, counts = await count_field_matches(page, containers, probes, high_accuracy, size)
+
+        best_selector = None
+        best_accuracy = 0.0
+        for pattern, matches in zip(patterns, counts):
+            if total_checked > 0:
+                accuracy = matches / total_checked
+                if accuracy > best_accuracy and accuracy >= min_accuracy:
+                    best_accuracy = accuracy
+                    best_selector = pattern
+
+        # Settled, or every container is already in the sample
+        if best_accuracy >= SETTLED_ACCURACY or total_checked < size:
+            break
+
+    return best_selector, best_accuracy
+
+
+def _score_to_confidence(accuracy: float, high: float = 0.95, medium: float = 0.85) -> ConfidenceLevel:
+    """Map a selector's sample accuracy to a confidence level"""
+    if accuracy >= high:
+        return ConfidenceLevel.HIGH
+    if accuracy >= medium:
+        return ConfidenceLevel.MEDIUM
+    return ConfidenceLevel.LOW
+
+
+async def _block_heavy_resources(route) -> None:
+    """Route handler that aborts image, media, font and stylesheet requests"""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def load_page(page, url: str, timeout: int) -> None:
+    """Navigate and return as soon as an item grid is in the DOM
+
+    Analysis is purely structural, so it starts at DOMContentLoaded once any
+    container pattern has 3 matches, rather than after networkidle. A grid
+    that has not appeared within ITEMS_WAIT_TIMEOUT gets LAZY_GRID_WAIT more
+    to render.
+    """
+    await page.goto(url, timeout=timeout, wait_until="domcontentloaded")
+    try:
+        await page.wait_for_function(
+            _ITEMS_RENDERED_JS, arg=list(_ITEM_CONTAINER_PATTERNS), timeout=min(timeout, ITEMS_WAIT_TIMEOUT)
+        )
+    except PlaywrightTimeoutError:
+        await page.wait_for_timeout(LAZY_GRID_WAIT)
+
+
+async def find_item_containers(page) -> Dict[str, int]:
+    """Find repeating element patterns that likely represent items"""
+    counts = await page.evaluate(_COUNT_CONTAINERS_JS, [_ITEM_CONTAINER_PATTERNS, CONTAINER_COUNT_ENOUGH])
+
+    # Minimum 3 items to be considered
+    return {pattern: count for pattern, count in zip(_ITEM_CONTAINER_PATTERNS, counts) if count >= 3}
+
+
+async def find_title_selector(
+    page,
+    containers: JSHandle,
+    container_selector: str,
+    sample_size: int = DEFAULT_SAMPLE_SIZE
+) -> Optional[FieldSelector]:
+    """Find selector for title/name field"""
+    # Most specific first, so a precise selector wins ties with a generic heading
+    patterns = [
+        ".product-title", ".product-name",
+        "[data-title]", "[data-name]",
+        ".title", ".name",
+        "h1", "h2", "h3", "h4"
+    ]
+
+    # Text of at least 5 characters
+    best_selector, best_accuracy = await select_pattern(
+        page, containers, sample_size, patterns,
+        [_to_probe(p, min_length=5) for p in patterns],
+        min_accuracy=0.9, high_accuracy=0.95
+    )
 
     if best_selector:
         # Generate fallback selector (less specific)
         fallback = best_selector.split(".")[0] if "." in best_selector else None
 
-        confidence = ConfidenceLevel.HIGH if best_accuracy >= 0.95 else \
-                    ConfidenceLevel.MEDIUM if best_accuracy >= 0.85 else \
-                    ConfidenceLevel.LOW
+        confidence = _score_to_confidence(best_accuracy)
 
         return FieldSelector(
             primary=f"{container_selector} {best_selector}",
@@ -103,56 +336,38 @@ async def find_title_selector(page, container_selector: str, sample_size: int =
     return None
 
 
-async def find_price_selector(page, container_selector: str, sample_size: int = 5) -> Optional[FieldSelector]:
+async def find_price_selector(
+    page,
+    containers: JSHandle,
+    container_selector: str,
+    sample_size: int = DEFAULT_SAMPLE_SIZE
+) -> Optional[FieldSelector]:
     """Find selector for price field"""
+    # Most specific first
     patterns = [
-        ".price", ".amount", ".cost", ".price-amount",
-        "[data-price]", "[data-amount]",
+        ".price-amount", ".price", "[data-price]",
+        ".amount", "[data-amount]", ".cost",
         "span:has-text('$')", "span:has-text('€')", "span:has-text('£')"
     ]
 
-    containers = await page.locator(container_selector).all()
-    containers = containers[:sample_size]
-
-    best_selector = None
-    best_accuracy = 0.0
-    best_attribute = None
-
-    for pattern in patterns:
-        matches = 0
-        total_checked = 0
-        has_data_attribute = "[data-" in pattern
-
-        for container in containers:
-            total_checked += 1
-            try:
-                elem = await container.query_selector(pattern)
-                if elem:
-                    # Check for data-price attribute first
-                    if has_data_attribute:
-                        attr_name = pattern.split("[data-")[1].split("]")[0]
-                        price_attr = await elem.get_attribute(f"data-{attr_name}")
-                        if price_attr and re.search(r'\d+\.?\d*', price_attr):
-                            matches += 1
-                    else:
-                        # Check text content
-                        text = await elem.text_content()
-                        if text and (re.search(r'[$€£]\s*\d+', text) or re.search(r'\d+\.?\d*', text)):
-                            matches += 1
-            except Exception:
-                continue
-
-        if total_checked > 0:
-            accuracy = matches / total_checked
-            if accuracy > best_accuracy and accuracy >= 0.85:
-                best_accuracy = accuracy
-                best_selector = pattern
-                best_attribute = f"data-{pattern.split('[data-')[1].split(']')[0]}" if has_data_attribute else None
+    # data-* patterns are read from the attribute, the rest from text content
+    attributes = [
+        f"data-{pattern.split('[data-')[1].split(']')[0]}" if "[data-" in pattern else None
+        for pattern in patterns
+    ]
+    probes = [
+        _to_probe(pattern, attr=attr, regexes=(_PRICE_NUM_RE,)) if attr else
+        _to_probe(pattern, regexes=(_PRICE_CURRENCY_RE, _PRICE_NUM_RE))
+        for pattern, attr in zip(patterns, attributes)
+    ]
+    best_selector, best_accuracy = await select_pattern(
+        page, containers, sample_size, patterns, probes,
+        min_accuracy=0.85, high_accuracy=0.95
+    )
+    best_attribute = attributes[patterns.index(best_selector)] if best_selector else None
 
     if best_selector:
-        confidence = ConfidenceLevel.HIGH if best_accuracy >= 0.95 else \
-                    ConfidenceLevel.MEDIUM if best_accuracy >= 0.85 else \
-                    ConfidenceLevel.LOW
+        confidence = _score_to_confidence(best_accuracy)
 
         return FieldSelector(
             primary=f"{container_selector} {best_selector}",
@@ -166,48 +381,28 @@ async def find_price_selector(page, container_selector: str, sample_size: int =
     return None
 
 
-async def find_image_selector(page, container_selector: str, sample_size: int = 5) -> Optional[FieldSelector]:
+async def find_image_selector(
+    page,
+    containers: JSHandle,
+    container_selector: str,
+    sample_size: int = DEFAULT_SAMPLE_SIZE
+) -> Optional[FieldSelector]:
     """Find selector for image URLs"""
+    # Most specific first
     patterns = [
-        "img", "img.product-image", "img[data-src]",
-        "picture img", "source[srcset]"
+        "img.product-image", "img[data-src]", "picture img",
+        "img", "source[srcset]"
     ]
 
-    containers = await page.locator(container_selector).all()
-    containers = containers[:sample_size]
-
-    best_selector = None
-    best_accuracy = 0.0
-
-    for pattern in patterns:
-        matches = 0
-        total_checked = 0
-
-        for container in containers:
-            total_checked += 1
-            try:
-                images = await container.query_selector_all(pattern)
-                if images:
-                    # Check if any image has valid src
-                    for img in images:
-                        src = await img.get_attribute("src")
-                        data_src = await img.get_attribute("data-src")
-                        if src or data_src:
-                            matches += 1
-                            break  # Count container as match
-            except Exception:
-                continue
-
-        if total_checked > 0:
-            accuracy = matches / total_checked
-            if accuracy > best_accuracy and accuracy >= 0.80:  # Lower threshold for images
-                best_accuracy = accuracy
-                best_selector = pattern
+    # A container matches when any of its images has a src or data-src
+    best_selector, best_accuracy = await select_pattern(
+        page, containers, sample_size, patterns,
+        [_to_probe(p, source=True) for p in patterns],
+        min_accuracy=0.80, high_accuracy=0.90  # Lower threshold for images
+    )
 
     if best_selector:
-        confidence = ConfidenceLevel.HIGH if best_accuracy >= 0.90 else \
-                    ConfidenceLevel.MEDIUM if best_accuracy >= 0.75 else \
-                    ConfidenceLevel.LOW
+        confidence = _score_to_confidence(best_accuracy, high=0.90, medium=0.75)
 
         return FieldSelector(
             primary=f"{container_selector} {best_selector}",
@@ -221,45 +416,29 @@ async def find_image_selector(page, container_selector: str, sample_size: int =
     return None
 
 
-async def find_description_selector(page, container_selector: str, sample_size: int = 5) -> Optional[FieldSelector]:
+async def find_description_selector(
+    page,
+    containers: JSHandle,
+    container_selector: str,
+    sample_size: int = DEFAULT_SAMPLE_SIZE
+) -> Optional[FieldSelector]:
     """Find selector for description field (optional)"""
+    # Most specific first
     patterns = [
+        ".product-description", "[data-description]",
         ".description", ".summary", ".excerpt",
-        ".product-description", "p",
-        "[data-description]"
+        "p"
     ]
 
-    containers = await page.locator(container_selector).all()
-    containers = containers[:sample_size]
-
-    best_selector = None
-    best_accuracy = 0.0
-
-    for pattern in patterns:
-        matches = 0
-        total_checked = 0
-
-        for container in containers:
-            total_checked += 1
-            try:
-                elem = await container.query_selector(pattern)
-                if elem:
-                    text = await elem.text_content()
-                    if text and len(text.strip()) >= 20:  # Descriptions are typically longer
-                        matches += 1
-            except Exception:
-                continue
-
-        if total_checked > 0:
-            accuracy = matches / total_checked
-            if accuracy > best_accuracy and accuracy >= 0.70:  # Lower threshold (optional field)
-                best_accuracy = accuracy
-                best_selector = pattern
+    # Descriptions are typically longer
+    best_selector, best_accuracy = await select_pattern(
+        page, containers, sample_size, patterns,
+        [_to_probe(p, min_length=20) for p in patterns],
+        min_accuracy=0.70, high_accuracy=0.90  # Lower threshold (optional field)
+    )
 
     if best_selector:
-        confidence = ConfidenceLevel.HIGH if best_accuracy >= 0.90 else \
-                    ConfidenceLevel.MEDIUM if best_accuracy >= 0.75 else \
-                    ConfidenceLevel.LOW
+        confidence = _score_to_confidence(best_accuracy, high=0.90, medium=0.75)
 
         return FieldSelector(
             primary=f"{container_selector} {best_selector}",
@@ -273,13 +452,14 @@ async def find_description_selector(page, container_selector: str, sample_size:
     return None
 
 
-async def analyze_dom(target_url: str, sample_size: int = 5, timeout: int = TIMEOUT) -> Dict:
+async def analyze_dom(target_url: str, sample_size: int = DEFAULT_SAMPLE_SIZE, timeout: int = TIMEOUT) -> Dict:
     """
     Main DOM analysis function
 
     Args:
         target_url: URL to analyze
-        sample_size: Number of items to sample for selector validation
+        sample_size: Most items sampled for selector validation; fewer are
+            used when a small sample already settles every field
         timeout: Page load timeout in milliseconds
 
     Returns:
@@ -290,10 +470,11 @@ async def analyze_dom(target_url: str, sample_size: int = 5, timeout: int = TIME
             # Launch browser
             browser = await p.chromium.launch(headless=True)
             context = await browser.new_context(user_agent=USER_AGENT)
+            await context.route("**/*", _block_heavy_resources)
             page = await context.new_page()
 
             # Navigate to target URL
-            await page.goto(target_url, timeout=timeout, wait_until="networkidle")
+            await load_page(page, target_url, timeout)
 
             # Find item containers
             print("Detecting item containers...")
@@ -312,54 +493,55 @@ async def analyze_dom(target_url: str, sample_size: int = 5, timeout: int = TIME
 
             print(f"✓ Item container detected: {best_container} ({total_items} items)")
 
-            # Find field selectors
+            # Every field probe checks the same sampled containers
+            sampled = min(sample_size, total_items)
+            containers = await sample_containers(page, best_container, sampled)
+
+            # The field probes are independent, so their evaluates go out together
+            print("Finding field selectors...")
+            title_selector, price_selector, image_selector, desc_selector = await asyncio.gather(
+                find_title_selector(page, containers, best_container, sampled),
+                find_price_selector(page, containers, best_container, sampled),
+                find_image_selector(page, containers, best_container, sampled),
+                find_description_selector(page, containers, best_container, sampled)
+            )
+
             field_selectors = {}
             confidence_scores = {}
 
             # Title (required)
-            print("Finding title selector...")
-            title_selector = await find_title_selector(page, best_container, sample_size)
             if title_selector:
                 field_selectors["title"] = title_selector
-                confidence_scores["title"] = 1.0 if title_selector.confidence == ConfidenceLevel.HIGH else \
-                                             0.85 if title_selector.confidence == ConfidenceLevel.MEDIUM else 0.7
+                confidence_scores["title"] = _CONF_SCORE[title_selector.confidence]
                 print(f"  ✓ Title: {title_selector.primary} (confidence: {title_selector.confidence})")
             else:
                 print("  ✗ Title selector not found")
 
             # Price (required)
-            print("Finding price selector...")
-            price_selector = await find_price_selector(page, best_container, sample_size)
             if price_selector:
                 field_selectors["price"] = price_selector
-                confidence_scores["price"] = 1.0 if price_selector.confidence == ConfidenceLevel.HIGH else \
-                                            0.85 if price_selector.confidence == ConfidenceLevel.MEDIUM else 0.7
+                confidence_scores["price"] = _CONF_SCORE[price_selector.confidence]
                 print(f"  ✓ Price: {price_selector.primary} (confidence: {price_selector.confidence})")
             else:
                 print("  ✗ Price selector not found")
 
             # Image URLs (required)
-            print("Finding image selector...")
-            image_selector = await find_image_selector(page, best_container, sample_size)
             if image_selector:
                 field_selectors["image_urls"] = image_selector
-                confidence_scores["image_urls"] = 1.0 if image_selector.confidence == ConfidenceLevel.HIGH else \
-                                                  0.85 if image_selector.confidence == ConfidenceLevel.MEDIUM else 0.7
+                confidence_scores["image_urls"] = _CONF_SCORE[image_selector.confidence]
                 print(f"  ✓ Images: {image_selector.primary} (confidence: {image_selector.confidence})")
             else:
                 print("  ✗ Image selector not found")
 
             # Description (optional)
-            print("Finding description selector...")
-            desc_selector = await find_description_selector(page, best_container, sample_size)
             if desc_selector:
                 field_selectors["description"] = desc_selector
-                confidence_scores["description"] = 1.0 if desc_selector.confidence == ConfidenceLevel.HIGH else \
-                                                   0.85 if desc_selector.confidence == ConfidenceLevel.MEDIUM else 0.7
+                confidence_scores["description"] = _CONF_SCORE[desc_selector.confidence]
                 print(f"  ✓ Description: {desc_selector.primary} (confidence: {desc_selector.confidence})")
             else:
                 print("  ⚠ Description selector not found (optional field)")
 
+            await containers.dispose()
             await browser.close()
 
             # Build result
@@ -376,7 +558,7 @@ async def analyze_dom(target_url: str, sample_size: int = 5, timeout: int = TIME
                 page_url=target_url,
                 analysis_timestamp=datetime.utcnow().isoformat() + "Z",
                 total_items_found=total_items,
-                notes=f"Analysis based on {min(sample_size, total_items)} sample items. " +
+                notes=f"Analysis based on up to {sampled} sample items. " +
                       (f"Description field has low completeness ({int(confidence_scores.get('description', 0)*100)}%)." if "description" in field_selectors else "")
             )
 
@@ -402,7 +584,7 @@ def main():
         description="Analyze DOM structure and generate selectors"
     )
     parser.add_argument("url", help="Target URL to analyze")
-    parser.add_argument("--sample-size", type=int, default=5, help="Number of items to sample")
+    parser.add_argument("--sample-size", type=int, default=DEFAULT_SAMPLE_SIZE, help="Maximum number of items to sample")
     parser.add_argument("--timeout", type=int, default=30, help="Page load timeout in seconds")
     parser.add_argument("--output", type=Path, help="Save selector map to file")
 
@@ -8,10 +8,27 @@ Usage:
     ensure_venv()
 """
 
+import functools
+import importlib.util
 import os
 import sys
 from pathlib import Path
 
+# Set once ensure_venv() has passed; the interpreter cannot change afterwards
+_VENV_OK = False
+
+
+@functools.lru_cache(maxsize=1)
+def _plugin_dir() -> Path:
+    """Plugin directory (parent of scripts/), resolved once"""
+    return Path(__file__).parent.parent.resolve()
+
+
+@functools.lru_cache(maxsize=1)
+def _venv_prefix() -> str:
+    """Resolved path of the plugin venv, as compared against sys.prefix"""
+    return str((_plugin_dir() / "venv").resolve())
+
 
 def ensure_venv() -> None:
     """
@@ -20,9 +37,11 @@ def ensure_venv() -> None:
     Raises:
         RuntimeError: If not running in venv
     """
-    # Get plugin directory (parent of scripts/)
-    plugin_dir = Path(__file__).parent.parent.resolve()
-    venv_path = plugin_dir / "venv"
+    global _VENV_OK
+    if _VENV_OK:
+        return
+
+    venv_path = _plugin_dir() / "venv"
 
     # Check if venv exists
     if not venv_path.exists():
@@ -33,7 +52,7 @@ def ensure_venv() -> None:
 
     # Check if we're running in venv
     # Method 1: Check sys.prefix
-    venv_prefix = str(venv_path.resolve())
+    venv_prefix = _venv_prefix()
     sys_prefix = str(Path(sys.prefix).resolve())
 
     if sys_prefix != venv_prefix:
@@ -50,15 +69,15 @@ def ensure_venv() -> None:
                 f"3. Use venv Python: {venv_path}/bin/python3 {sys.argv[0]}"
             )
 
-    # Verify required packages are available
-    try:
-        import requests
-        import playwright
-    except ImportError as e:
-        raise RuntimeError(
-            f"Required package not found: {e}\n"
-            f"Please run: source {venv_path}/bin/activate && pip install -r requirements.txt"
-        )
+    # Verify required packages are installed, without importing them
+    for package in ("requests", "aiohttp", "playwright", "pydantic"):
+        if importlib.util.find_spec(package) is None:
+            raise RuntimeError(
+                f"Required package not found: {package}\n"
+                f"Please run: source {venv_path}/bin/activate && pip install -r requirements.txt"
+            )
+
+    _VENV_OK = True
 
 
 def get_venv_python() -> Path:
@@ -68,8 +87,7 @@ def get_venv_python() -> Path:
     Returns:
         Path to venv Python executable
     """
-    plugin_dir = Path(__file__).parent.parent.resolve()
-    venv_path = plugin_dir / "venv"
+    venv_path = _plugin_dir() / "venv"
 
     if os.name == "nt":  # Windows
         return venv_path / "Scripts" / "python.exe"
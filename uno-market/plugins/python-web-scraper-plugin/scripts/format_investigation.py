@@ -5,11 +5,17 @@ Formats investigation reports for human-readable CLI output
 Implements T043 [US2] - Investigation report CLI formatter
 """
 
+import io
 import json
 import sys
 from pathlib import Path
 from typing import Dict
 
+try:
+    import orjson
+except ImportError:  # Optional speedup - fall back to the stdlib codec
+    orjson = None
+
 
 # ANSI color codes
 class Colors:
@@ -24,6 +30,36 @@ class Colors:
     DIM = '\033[2m'
 
 
+# Endpoint confidence and HTTP status class (code // 100) colors; anything
+# else is shown in red
+_CONF_COLOR = {"high": Colors.GREEN, "medium": Colors.YELLOW}
+_STATUS_COLOR = {2: Colors.GREEN, 3: Colors.YELLOW}
+
+SAMPLE_PREVIEW_CHARS = 200  # Verbose mode shows this much of each sample response
+_SAMPLE_ENCODER = json.JSONEncoder(indent=2)
+
+
+def _truncated_json(obj, limit: int) -> str:
+    """Pretty-print obj as JSON, cut to limit chars with a trailing "..."
+
+    Encoding stops as soon as the limit is passed, so a large sample response
+    is never serialized in full just to show its first few lines.
+    """
+    chunks = []
+    total = 0
+    for chunk in _SAMPLE_ENCODER.iterencode(obj):
+        chunks.append(chunk)
+        total += len(chunk)
+        if total > limit:
+            return ''.join(chunks)[:limit] + "..."
+    return ''.join(chunks)
+
+
+def _loads(data: bytes):
+    """Parse JSON from raw bytes"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
 def format_investigation_report(report: Dict, color: bool = True, verbose: bool = False) -> str:
     """
     Format investigation report for CLI display
@@ -36,51 +72,55 @@ def format_investigation_report(report: Dict, color: bool = True, verbose: bool
     Returns:
         Formatted report string
     """
-    def c(text, color_code):
-        """Apply color if enabled"""
-        if color:
-            return f"{color_code}{text}{Colors.RESET}"
-        return text
+    # Color prefixes are chosen once; with color off they are all empty
+    if color:
+        bold, dim, reset = Colors.BOLD, Colors.DIM, Colors.RESET
+        red, green, yellow = Colors.RED, Colors.GREEN, Colors.YELLOW
+        blue, cyan = Colors.BLUE, Colors.CYAN
+        conf_colors, status_colors = _CONF_COLOR, _STATUS_COLOR
+    else:
+        bold = dim = reset = red = green = yellow = blue = cyan = ''
+        conf_colors = status_colors = {}
+    rule = '=' * 70
 
-    lines = []
+    buf = io.StringIO()
+    w = buf.write
 
     # Header
-    lines.append(f"\n{'='*70}")
-    lines.append(c("INVESTIGATION REPORT", Colors.BOLD))
-    lines.append(f"{'='*70}\n")
+    w(f"\n{rule}\n{bold}INVESTIGATION REPORT{reset}\n{rule}\n\n")
 
     # Target information
-    lines.append(c("🎯 TARGET", Colors.BOLD))
-    lines.append(f"   URL: {report.get('target_url', 'N/A')}")
-    lines.append(f"   Timestamp: {report.get('timestamp', 'N/A')}")
+    w(f"{bold}🎯 TARGET{reset}\n")
+    w(f"   URL: {report.get('target_url', 'N/A')}\n")
+    w(f"   Timestamp: {report.get('timestamp', 'N/A')}\n")
 
     # Platform detection
     platform = report.get('platform_detected', 'unknown')
     platform_conf = report.get('platform_confidence', 0)
 
-    lines.append(f"\n{c('🔍 PLATFORM DETECTION', Colors.BOLD)}")
-    lines.append(f"   Platform: {c(platform.upper(), Colors.CYAN)}")
-    lines.append(f"   Confidence: {platform_conf:.1%}")
+    w(f"\n{bold}🔍 PLATFORM DETECTION{reset}\n")
+    w(f"   Platform: {cyan}{platform.upper()}{reset}\n")
+    w(f"   Confidence: {platform_conf:.1%}\n")
 
     # Recommended strategy
     strategy = report.get('recommended_strategy', 'unknown')
     confidence = report.get('confidence_score', 0)
 
-    lines.append(f"\n{c('📋 RECOMMENDED STRATEGY', Colors.BOLD)}")
+    w(f"\n{bold}📋 RECOMMENDED STRATEGY{reset}\n")
 
     if strategy == "api":
-        strategy_display = c("API Scraping", Colors.GREEN)
+        strategy_display = f"{green}API Scraping{reset}"
         strategy_icon = "✓"
     else:
-        strategy_display = c("Browser Scraping", Colors.YELLOW)
+        strategy_display = f"{yellow}Browser Scraping{reset}"
         strategy_icon = "⚠"
 
-    lines.append(f"   {strategy_icon} Strategy: {strategy_display}")
-    lines.append(f"   Overall Confidence: {c(f'{confidence:.1%}', Colors.GREEN if confidence >= 0.7 else Colors.YELLOW)}")
+    w(f"   {strategy_icon} Strategy: {strategy_display}\n")
+    w(f"   Overall Confidence: {green if confidence >= 0.7 else yellow}{confidence:.1%}{reset}\n")
 
     # Discovered endpoints
     endpoints = report.get('discovered_endpoints', [])
-    lines.append(f"\n{c('🔗 DISCOVERED ENDPOINTS', Colors.BOLD)} ({len(endpoints)} found)")
+    w(f"\n{bold}🔗 DISCOVERED ENDPOINTS{reset} ({len(endpoints)} found)\n")
 
     if endpoints:
         for idx, endpoint in enumerate(endpoints, 1):
@@ -89,77 +129,61 @@ def format_investigation_report(report: Dict, color: bool = True, verbose: bool
             conf = endpoint.get('confidence', 'unknown')
             status = endpoint.get('status_code', 0)
 
-            # Confidence color coding
-            if conf == "high":
-                conf_color = Colors.GREEN
-            elif conf == "medium":
-                conf_color = Colors.YELLOW
-            else:
-                conf_color = Colors.RED
-
-            # Status code color coding
-            if 200 <= status < 300:
-                status_color = Colors.GREEN
-            elif 300 <= status < 400:
-                status_color = Colors.YELLOW
-            else:
-                status_color = Colors.RED
-
-            lines.append(f"\n   {idx}. {c(url, Colors.BLUE)}")
-            lines.append(f"      Method: {method}")
-            lines.append(f"      Status: {c(str(status), status_color)}")
-            lines.append(f"      Confidence: {c(conf.upper(), conf_color)}")
+            conf_color = conf_colors.get(conf, red)
+            status_color = status_colors.get(status // 100, red)
+
+            w(f"\n   {idx}. {blue}{url}{reset}\n")
+            w(f"      Method: {method}\n")
+            w(f"      Status: {status_color}{status}{reset}\n")
+            w(f"      Confidence: {conf_color}{conf.upper()}{reset}\n")
 
             # Show sample response in verbose mode
             if verbose and endpoint.get('sample_response'):
                 sample = endpoint['sample_response']
-                sample_str = json.dumps(sample, indent=2)
-                # Truncate if too long
-                if len(sample_str) > 200:
-                    sample_str = sample_str[:200] + "..."
-                lines.append(f"      Sample Response:")
+                sample_str = _truncated_json(sample, SAMPLE_PREVIEW_CHARS)
+                w("      Sample Response:\n")
                 for line in sample_str.split('\n'):
-                    lines.append(f"        {c(line, Colors.DIM)}")
+                    w(f"        {dim}{line}{reset}\n")
     else:
-        lines.append(f"   {c('No API endpoints found', Colors.YELLOW)}")
-        lines.append(f"   Browser scraping will be required")
+        w(f"   {yellow}No API endpoints found{reset}\n")
+        w("   Browser scraping will be required\n")
 
     # Metadata
     metadata = report.get('metadata', {})
     if metadata:
-        lines.append(f"\n{c('📊 INVESTIGATION METADATA', Colors.BOLD)}")
+        w(f"\n{bold}📊 INVESTIGATION METADATA{reset}\n")
         duration = metadata.get('investigation_duration_seconds', 0)
         probed = metadata.get('endpoints_probed', 0)
         found = metadata.get('endpoints_found', 0)
 
-        lines.append(f"   Duration: {duration:.2f}s")
-        lines.append(f"   Endpoints Probed: {probed}")
-        lines.append(f"   Endpoints Found: {found}")
+        w(f"   Duration: {duration:.2f}s\n")
+        w(f"   Endpoints Probed: {probed}\n")
+        w(f"   Endpoints Found: {found}\n")
 
         if verbose and metadata.get('techniques_used'):
-            lines.append(f"   Techniques Used:")
+            w("   Techniques Used:\n")
             for technique in metadata['techniques_used']:
-                lines.append(f"      - {technique}")
+                w(f"      - {technique}\n")
 
     # Next steps
-    lines.append(f"\n{c('💡 NEXT STEPS', Colors.BOLD)}")
+    w(f"\n{bold}💡 NEXT STEPS{reset}\n")
 
     if strategy == "api" and endpoints:
-        lines.append(f"   1. Review discovered API endpoints above")
-        lines.append(f"   2. Use /scrape-url to generate API scraper automatically")
-        lines.append(f"   3. Or use /validate-investigation to verify before scraping")
+        w("   1. Review discovered API endpoints above\n")
+        w("   2. Use /scrape-url to generate API scraper automatically\n")
+        w("   3. Or use /validate-investigation to verify before scraping\n")
     elif strategy == "browser":
-        lines.append(f"   1. Run /detect-pagination to analyze pagination strategy")
-        lines.append(f"   2. Run /analyze-dom to generate CSS selectors")
-        lines.append(f"   3. Use /scrape-url to generate browser scraper automatically")
+        w("   1. Run /detect-pagination to analyze pagination strategy\n")
+        w("   2. Run /analyze-dom to generate CSS selectors\n")
+        w("   3. Use /scrape-url to generate browser scraper automatically\n")
     else:
-        lines.append(f"   1. Review investigation results")
-        lines.append(f"   2. Consider running with --deep-scan flag for more thorough analysis")
-        lines.append(f"   3. Or provide custom --api-patterns for specialized endpoint detection")
+        w("   1. Review investigation results\n")
+        w("   2. Consider running with --deep-scan flag for more thorough analysis\n")
+        w("   3. Or provide custom --api-patterns for specialized endpoint detection\n")
 
-    lines.append(f"\n{'='*70}\n")
+    w(f"\n{rule}\n")
 
-    return '\n'.join(lines)
+    return buf.getvalue()
 
 
 def main():
@@ -194,9 +218,8 @@ def main():
         sys.exit(1)
 
     try:
-        with open(args.report_file, "r") as f:
-            report = json.load(f)
-    except json.JSONDecodeError as e:
+        report = _loads(args.report_file.read_bytes())
+    except json.JSONDecodeError as e:  # orjson's decode error subclasses it
         print(f"Error: Invalid JSON in report file: {e}", file=sys.stderr)
         sys.exit(1)
 
@@ -7,163 +7,280 @@ Implements T065 - Metrics analysis and reporting
 
 import json
 import sys
-from collections import defaultdict
+from array import array
+from collections import Counter, deque
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional
 
+try:
+    import orjson
+except ImportError:  # Optional speedup - fall back to the stdlib codec
+    orjson = None
 
-def load_metrics(metrics_file: Path, hours: int = None) -> List[Dict]:
+try:
+    import numpy as np
+except ImportError:  # Optional speedup - fall back to the builtin sum()
+    np = None
+
+NUMPY_MIN_ROWS = 4096  # Shorter columns are summed faster by the builtin sum()
+READ_BUFFER_SIZE = 1 << 20  # Metrics files are read in 1 MiB chunks
+RECENT_ERRORS = 5  # Latest error events listed in the report
+METRIC_EVENT_TYPES = ("scraping_session", "investigation", "validation", "error")
+
+
+def _loads(data):
+    """Parse one JSON document from UTF-8 bytes; surrounding whitespace is ignored"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _dumpb_pretty(obj) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes
+
+    Breakdown keys can be null (e.g. a session logged without a platform), so
+    non-str keys are allowed and written as strings, as json.dumps does.
     """
-    Load metrics from JSONL file
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def iter_metrics(
+    metrics_file: Path,
+    hours: int = None,
+    event_types: Optional[Iterable[str]] = None
+) -> Iterator[Dict]:
+    """
+    Stream metrics from JSONL file, one parsed entry at a time
+
+    With event_types given, a line is only parsed when one of the quoted type
+    names occurs in its raw bytes; the rare false positive is dropped after
+    parsing by its actual event_type.
 
     Args:
         metrics_file: Path to metrics JSONL file
         hours: Optional filter for recent metrics (last N hours)
+        event_types: Optional filter for these event types only
 
-    Returns:
-        List of metric entries
+    Yields:
+        Metric entries, in file order
     """
     if not metrics_file.exists():
-        return []
+        return
 
-    entries = []
-    cutoff_time = None
+    wanted = tags = None
+    if event_types is not None:
+        wanted = frozenset(event_types)
+        tags = tuple(f'"{event_type}"'.encode() for event_type in wanted)
+
+    # Entry timestamps are ISO 8601 UTC strings, which sort chronologically
+    # as plain strings, so the cutoff is compared in that form
+    cutoff = None
 
     if hours:
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+        cutoff = (datetime.utcnow() - timedelta(hours=hours)).isoformat(timespec="microseconds")
 
-    with open(metrics_file, "r") as f:
+    # Lines stay raw bytes; both JSON parsers decode UTF-8 themselves
+    with open(metrics_file, "rb", buffering=READ_BUFFER_SIZE) as f:
         for line in f:
+            if tags is not None and not any(tag in line for tag in tags):
+                continue
+
             try:
-                entry = json.loads(line.strip())
+                entry = _loads(line)
 
-                # Filter by time if requested
-                if cutoff_time:
-                    entry_time = datetime.fromisoformat(entry["timestamp"].replace("Z", ""))
-                    if entry_time < cutoff_time:
-                        continue
+                if wanted is not None and entry.get("event_type") not in wanted:
+                    continue
 
-                entries.append(entry)
-            except (json.JSONDecodeError, KeyError):
+                # Filter by time if requested
+                if cutoff and entry["timestamp"] < cutoff:
+                    continue
+            except (json.JSONDecodeError, KeyError):  # orjson's decode error subclasses it
                 continue
 
-    return entries
+            yield entry
 
 
-def analyze_scraping_sessions(entries: List[Dict]) -> Dict:
+def load_metrics(
+    metrics_file: Path,
+    hours: int = None,
+    event_types: Optional[Iterable[str]] = None
+) -> List[Dict]:
     """
-    Analyze scraping session metrics
+    Load metrics from JSONL file
 
     Args:
-        entries: List of metric entries
+        metrics_file: Path to metrics JSONL file
+        hours: Optional filter for recent metrics (last N hours)
+        event_types: Optional filter for these event types only
 
     Returns:
-        Analysis dictionary
+        List of metric entries
     """
-    scraping_entries = [e for e in entries if e.get("event_type") == "scraping_session"]
-
-    if not scraping_entries:
-        return {"total_sessions": 0}
-
-    total_sessions = len(scraping_entries)
-    total_items = sum(e.get("items_scraped", 0) for e in scraping_entries)
-    total_duration = sum(e.get("duration_seconds", 0) for e in scraping_entries)
-    avg_duration = total_duration / total_sessions if total_sessions > 0 else 0
-
-    # Quality scores
-    quality_scores = [e.get("quality_score", 0) for e in scraping_entries if e.get("quality_score")]
-    avg_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0
-
-    # Method breakdown
-    methods = defaultdict(int)
-    for e in scraping_entries:
-        method = e.get("scraping_method", "unknown")
-        methods[method] += 1
-
-    # Platform breakdown
-    platforms = defaultdict(int)
-    for e in scraping_entries:
-        platform = e.get("platform", "unknown")
-        platforms[platform] += 1
-
-    # Pagination breakdown
-    pagination_types = defaultdict(int)
-    for e in scraping_entries:
-        pag_type = e.get("pagination_type", "unknown")
-        pagination_types[pag_type] += 1
+    return list(iter_metrics(metrics_file, hours=hours, event_types=event_types))
 
-    # Errors
-    total_errors = sum(e.get("errors", 0) for e in scraping_entries)
 
-    return {
-        "total_sessions": total_sessions,
-        "total_items_scraped": total_items,
-        "total_duration_seconds": round(total_duration, 2),
-        "avg_duration_seconds": round(avg_duration, 2),
-        "avg_quality_score": round(avg_quality, 1),
-        "methods": dict(methods),
-        "platforms": dict(platforms),
-        "pagination_types": dict(pagination_types),
-        "total_errors": total_errors,
-        "items_per_session": round(total_items / total_sessions, 1) if total_sessions > 0 else 0
-    }
+def _column_sum(column: array) -> float:
+    """Sum a float64 column, in NumPy once the column is long enough"""
+    if np is not None and len(column) >= NUMPY_MIN_ROWS:
+        return float(np.frombuffer(column, dtype=np.float64).sum())
+    return sum(column)
 
 
-def analyze_investigations(entries: List[Dict]) -> Dict:
+def _column_mean(column: array) -> float:
+    """Mean of a float64 column in one pass with no temporaries, 0 when empty"""
+    return _column_sum(column) / len(column) if column else 0
+
+
+def analyze_metrics(entries: Iterable[Dict]) -> Dict:
     """
-    Analyze investigation metrics
+    Analyze every metric type in a single pass over the entries
+
+    Each event type gathers its fields as columns, so the entries are
+    traversed once rather than once per analyzer and field. Categorical
+    columns are tallied by Counter in one C loop each, and float fields go
+    into contiguous float64 arrays that _column_sum can hand to NumPy without
+    copying. Entries may be streamed straight from iter_metrics, so the file
+    is never held as a list of dicts.
 
     Args:
-        entries: List of metric entries
+        entries: Metric entries, as a list or any iterable
 
     Returns:
-        Analysis dictionary
+        Analysis dictionary with scraping, investigation, validation and
+        errors sections
     """
-    investigation_entries = [e for e in entries if e.get("event_type") == "investigation"]
-
-    if not investigation_entries:
-        return {"total_investigations": 0}
-
-    total = len(investigation_entries)
-    total_duration = sum(e.get("duration_seconds", 0) for e in investigation_entries)
-    avg_duration = total_duration / total if total > 0 else 0
+    # Scraping session columns
+    session_items, session_errors = [], []
+    session_durations, session_qualities = array("d"), array("d")
+    methods, platforms, pagination_types = [], [], []
+
+    # Investigation columns
+    investigation_endpoints = []
+    investigation_durations, investigation_confidences = array("d"), array("d")
+    strategies, platforms_detected = [], []
+
+    # Validation columns
+    validations_passed = 0
+    validation_items = []
+    validation_qualities = array("d")
+
+    error_types = []
+    recent_errors = deque(maxlen=RECENT_ERRORS)
+    total_entries = 0
+    get = dict.get  # Bound once; called for every field of every entry
+
+    for e in entries:
+        total_entries += 1
+        event_type = get(e, "event_type")
+
+        if event_type == "scraping_session":
+            session_items.append(get(e, "items_scraped", 0))
+            session_durations.append(get(e, "duration_seconds", 0))
+            quality = get(e, "quality_score", 0)
+            if quality:
+                session_qualities.append(quality)
+            session_errors.append(get(e, "errors", 0))
+            methods.append(get(e, "scraping_method", "unknown"))
+            platforms.append(get(e, "platform", "unknown"))
+            pagination_types.append(get(e, "pagination_type", "unknown"))
+
+        elif event_type == "investigation":
+            investigation_durations.append(get(e, "duration_seconds", 0))
+            investigation_endpoints.append(get(e, "endpoints_found", 0))
+            investigation_confidences.append(get(e, "confidence_score", 0))
+            strategies.append(get(e, "recommended_strategy", "unknown"))
+            platforms_detected.append(get(e, "platform_detected", "unknown"))
+
+        elif event_type == "validation":
+            if get(e, "schema_passed", False):
+                validations_passed += 1
+            validation_qualities.append(get(e, "quality_score", 0))
+            validation_items.append(get(e, "total_items", 0))
+
+        elif event_type == "error":
+            error_types.append(get(e, "error_type", "unknown"))
+            recent_errors.append({
+                "timestamp": get(e, "timestamp"),
+                "type": get(e, "error_type"),
+                "message": get(e, "error_message", "")[:100]
+            })
 
-    # Endpoints found
-    total_endpoints = sum(e.get("endpoints_found", 0) for e in investigation_entries)
-    avg_endpoints = total_endpoints / total if total > 0 else 0
+    # Scraping sessions
+    total_sessions = len(session_items)
+    if total_sessions:
+        total_items = sum(session_items)
+        total_duration = _column_sum(session_durations)
+        avg_quality = _column_mean(session_qualities)
+        scraping = {
+            "total_sessions": total_sessions,
+            "total_items_scraped": total_items,
+            "total_duration_seconds": round(total_duration, 2),
+            "avg_duration_seconds": round(total_duration / total_sessions, 2),
+            "avg_quality_score": round(avg_quality, 1),
+            "methods": dict(Counter(methods)),
+            "platforms": dict(Counter(platforms)),
+            "pagination_types": dict(Counter(pagination_types)),
+            "total_errors": sum(session_errors),
+            "items_per_session": round(total_items / total_sessions, 1)
+        }
+    else:
+        scraping = {"total_sessions": 0}
 
-    # Confidence scores
-    confidence_scores = [e.get("confidence_score", 0) for e in investigation_entries]
-    avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
+    # Investigations
+    total_investigations = len(investigation_endpoints)
+    if total_investigations:
+        total_duration = _column_sum(investigation_durations)
+        total_endpoints = sum(investigation_endpoints)
+        investigation = {
+            "total_investigations": total_investigations,
+            "total_duration_seconds": round(total_duration, 2),
+            "avg_duration_seconds": round(total_duration / total_investigations, 2),
+            "total_endpoints_found": total_endpoints,
+            "avg_endpoints_per_investigation": round(total_endpoints / total_investigations, 1),
+            "avg_confidence_score": round(_column_mean(investigation_confidences), 3),
+            "recommended_strategies": dict(Counter(strategies)),
+            "platforms_detected": dict(Counter(platforms_detected))
+        }
+    else:
+        investigation = {"total_investigations": 0}
 
-    # Recommended strategies
-    strategies = defaultdict(int)
-    for e in investigation_entries:
-        strategy = e.get("recommended_strategy", "unknown")
-        strategies[strategy] += 1
+    # Validations
+    total_validations = len(validation_items)
+    if total_validations:
+        validation = {
+            "total_validations": total_validations,
+            "passed": validations_passed,
+            "failed": total_validations - validations_passed,
+            "pass_rate": round((validations_passed / total_validations * 100), 1),
+            "total_items_validated": sum(validation_items),
+            "avg_quality_score": round(_column_mean(validation_qualities), 1)
+        }
+    else:
+        validation = {"total_validations": 0}
 
-    # Platforms
-    platforms = defaultdict(int)
-    for e in investigation_entries:
-        platform = e.get("platform_detected", "unknown")
-        platforms[platform] += 1
+    # Errors
+    if error_types:
+        errors = {
+            "total_errors": len(error_types),
+            "error_types": dict(Counter(error_types)),
+            "recent_errors": list(recent_errors)
+        }
+    else:
+        errors = {"total_errors": 0}
 
     return {
-        "total_investigations": total,
-        "total_duration_seconds": round(total_duration, 2),
-        "avg_duration_seconds": round(avg_duration, 2),
-        "total_endpoints_found": total_endpoints,
-        "avg_endpoints_per_investigation": round(avg_endpoints, 1),
-        "avg_confidence_score": round(avg_confidence, 3),
-        "recommended_strategies": dict(strategies),
-        "platforms_detected": dict(platforms)
+        "scraping": scraping,
+        "investigation": investigation,
+        "validation": validation,
+        "errors": errors,
+        "total_entries": total_entries
     }
 
 
-def analyze_validations(entries: List[Dict]) -> Dict:
+def analyze_scraping_sessions(entries: List[Dict]) -> Dict:
     """
-    Analyze validation metrics
+    Analyze scraping session metrics
 
     Args:
         entries: List of metric entries
@@ -171,35 +288,25 @@ def analyze_validations(entries: List[Dict]) -> Dict:
     Returns:
         Analysis dictionary
     """
-    validation_entries = [e for e in entries if e.get("event_type") == "validation"]
+    return analyze_metrics(entries)["scraping"]
 
-    if not validation_entries:
-        return {"total_validations": 0}
 
-    total = len(validation_entries)
-    passed = sum(1 for e in validation_entries if e.get("schema_passed", False))
-    failed = total - passed
-
-    # Quality scores
-    quality_scores = [e.get("quality_score", 0) for e in validation_entries]
-    avg_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0
+def analyze_investigations(entries: List[Dict]) -> Dict:
+    """
+    Analyze investigation metrics
 
-    # Total items validated
-    total_items = sum(e.get("total_items", 0) for e in validation_entries)
+    Args:
+        entries: List of metric entries
 
-    return {
-        "total_validations": total,
-        "passed": passed,
-        "failed": failed,
-        "pass_rate": round((passed / total * 100), 1) if total > 0 else 0,
-        "total_items_validated": total_items,
-        "avg_quality_score": round(avg_quality, 1)
-    }
+    Returns:
+        Analysis dictionary
+    """
+    return analyze_metrics(entries)["investigation"]
 
 
-def analyze_errors(entries: List[Dict]) -> Dict:
+def analyze_validations(entries: List[Dict]) -> Dict:
     """
-    Analyze error metrics
+    Analyze validation metrics
 
     Args:
         entries: List of metric entries
@@ -207,32 +314,20 @@ def analyze_errors(entries: List[Dict]) -> Dict:
     Returns:
         Analysis dictionary
     """
-    error_entries = [e for e in entries if e.get("event_type") == "error"]
+    return analyze_metrics(entries)["validation"]
 
-    if not error_entries:
-        return {"total_errors": 0}
 
-    # Error type breakdown
-    error_types = defaultdict(int)
-    for e in error_entries:
-        error_type = e.get("error_type", "unknown")
-        error_types[error_type] += 1
+def analyze_errors(entries: List[Dict]) -> Dict:
+    """
+    Analyze error metrics
 
-    # Recent errors (last 5)
-    recent_errors = error_entries[-5:] if len(error_entries) >= 5 else error_entries
+    Args:
+        entries: List of metric entries
 
-    return {
-        "total_errors": len(error_entries),
-        "error_types": dict(error_types),
-        "recent_errors": [
-            {
-                "timestamp": e.get("timestamp"),
-                "type": e.get("error_type"),
-                "message": e.get("error_message", "")[:100]
-            }
-            for e in recent_errors
-        ]
-    }
+    Returns:
+        Analysis dictionary
+    """
+    return analyze_metrics(entries)["errors"]
 
 
 def print_report(analysis: Dict, verbose: bool = False):
@@ -243,74 +338,78 @@ def print_report(analysis: Dict, verbose: bool = False):
         analysis: Analysis dictionary
         verbose: Include detailed breakdowns
     """
-    print(f"\n{'='*70}")
-    print(f"SCRAPING METRICS REPORT")
-    print(f"{'='*70}\n")
+    out = []
+
+    out.append(f"\n{'='*70}")
+    out.append("SCRAPING METRICS REPORT")
+    out.append(f"{'='*70}\n")
 
     # Scraping sessions
     scraping = analysis.get("scraping", {})
     if scraping.get("total_sessions", 0) > 0:
-        print(f"📊 SCRAPING SESSIONS")
-        print(f"   Total Sessions: {scraping['total_sessions']}")
-        print(f"   Total Items Scraped: {scraping['total_items_scraped']}")
-        print(f"   Avg Items/Session: {scraping['items_per_session']}")
-        print(f"   Avg Duration: {scraping['avg_duration_seconds']:.1f}s")
-        print(f"   Avg Quality Score: {scraping['avg_quality_score']}/100")
-        print(f"   Total Errors: {scraping['total_errors']}")
+        out.append("📊 SCRAPING SESSIONS")
+        out.append(f"   Total Sessions: {scraping['total_sessions']}")
+        out.append(f"   Total Items Scraped: {scraping['total_items_scraped']}")
+        out.append(f"   Avg Items/Session: {scraping['items_per_session']}")
+        out.append(f"   Avg Duration: {scraping['avg_duration_seconds']:.1f}s")
+        out.append(f"   Avg Quality Score: {scraping['avg_quality_score']}/100")
+        out.append(f"   Total Errors: {scraping['total_errors']}")
 
         if verbose and scraping.get("methods"):
-            print(f"\n   Methods:")
+            out.append("\n   Methods:")
             for method, count in scraping["methods"].items():
-                print(f"      {method}: {count}")
+                out.append(f"      {method}: {count}")
 
         if verbose and scraping.get("platforms"):
-            print(f"\n   Platforms:")
+            out.append("\n   Platforms:")
             for platform, count in scraping["platforms"].items():
-                print(f"      {platform}: {count}")
+                out.append(f"      {platform}: {count}")
 
     # Investigations
     investigation = analysis.get("investigation", {})
     if investigation.get("total_investigations", 0) > 0:
-        print(f"\n🔍 INVESTIGATIONS")
-        print(f"   Total Investigations: {investigation['total_investigations']}")
-        print(f"   Avg Duration: {investigation['avg_duration_seconds']:.1f}s")
-        print(f"   Total Endpoints Found: {investigation['total_endpoints_found']}")
-        print(f"   Avg Endpoints/Investigation: {investigation['avg_endpoints_per_investigation']}")
-        print(f"   Avg Confidence: {investigation['avg_confidence_score']:.1%}")
+        out.append("\n🔍 INVESTIGATIONS")
+        out.append(f"   Total Investigations: {investigation['total_investigations']}")
+        out.append(f"   Avg Duration: {investigation['avg_duration_seconds']:.1f}s")
+        out.append(f"   Total Endpoints Found: {investigation['total_endpoints_found']}")
+        out.append(f"   Avg Endpoints/Investigation: {investigation['avg_endpoints_per_investigation']}")
+        out.append(f"   Avg Confidence: {investigation['avg_confidence_score']:.1%}")
 
         if verbose and investigation.get("recommended_strategies"):
-            print(f"\n   Recommended Strategies:")
+            out.append("\n   Recommended Strategies:")
             for strategy, count in investigation["recommended_strategies"].items():
-                print(f"      {strategy}: {count}")
+                out.append(f"      {strategy}: {count}")
 
     # Validations
     validation = analysis.get("validation", {})
     if validation.get("total_validations", 0) > 0:
-        print(f"\n✓ VALIDATIONS")
-        print(f"   Total Validations: {validation['total_validations']}")
-        print(f"   Passed: {validation['passed']}")
-        print(f"   Failed: {validation['failed']}")
-        print(f"   Pass Rate: {validation['pass_rate']}%")
-        print(f"   Total Items Validated: {validation['total_items_validated']}")
-        print(f"   Avg Quality Score: {validation['avg_quality_score']}/100")
+        out.append("\n✓ VALIDATIONS")
+        out.append(f"   Total Validations: {validation['total_validations']}")
+        out.append(f"   Passed: {validation['passed']}")
+        out.append(f"   Failed: {validation['failed']}")
+        out.append(f"   Pass Rate: {validation['pass_rate']}%")
+        out.append(f"   Total Items Validated: {validation['total_items_validated']}")
+        out.append(f"   Avg Quality Score: {validation['avg_quality_score']}/100")
 
     # Errors
     errors = analysis.get("errors", {})
     if errors.get("total_errors", 0) > 0:
-        print(f"\n✗ ERRORS")
-        print(f"   Total Errors: {errors['total_errors']}")
+        out.append("\n✗ ERRORS")
+        out.append(f"   Total Errors: {errors['total_errors']}")
 
         if verbose and errors.get("error_types"):
-            print(f"\n   Error Types:")
+            out.append("\n   Error Types:")
             for error_type, count in errors["error_types"].items():
-                print(f"      {error_type}: {count}")
+                out.append(f"      {error_type}: {count}")
 
         if errors.get("recent_errors"):
-            print(f"\n   Recent Errors:")
+            out.append("\n   Recent Errors:")
             for error in errors["recent_errors"]:
-                print(f"      [{error['type']}] {error['message']}")
+                out.append(f"      [{error['type']}] {error['message']}")
+
+    out.append(f"\n{'='*70}\n")
 
-    print(f"\n{'='*70}\n")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def main():
@@ -345,25 +444,19 @@ def main():
 
     args = parser.parse_args()
 
-    # Load metrics
-    entries = load_metrics(args.metrics_file, hours=args.hours)
+    # Load and analyze metrics in one streaming pass; lines of any other
+    # event type are skipped without being parsed
+    analysis = analyze_metrics(
+        iter_metrics(args.metrics_file, hours=args.hours, event_types=METRIC_EVENT_TYPES)
+    )
 
-    if not entries:
+    if not analysis["total_entries"]:
         print("No metrics found.", file=sys.stderr)
         sys.exit(1)
 
-    # Analyze metrics
-    analysis = {
-        "scraping": analyze_scraping_sessions(entries),
-        "investigation": analyze_investigations(entries),
-        "validation": analyze_validations(entries),
-        "errors": analyze_errors(entries),
-        "total_entries": len(entries)
-    }
-
     # Output
     if args.json:
-        print(json.dumps(analysis, indent=2))
+        sys.stdout.buffer.write(_dumpb_pretty(analysis) + b"\n")
     else:
         print_report(analysis, verbose=args.verbose)
 
@@ -4,11 +4,33 @@ Pydantic Models for Python Web Scraper Plugin
 Implements schema validation for all data structures
 """
 
-from datetime import datetime
+import calendar
+import re
 from enum import Enum
-from typing import Dict, List, Optional, Union
+from typing import Annotated, Dict, List, Optional, Union
 
-from pydantic import BaseModel, Field, HttpUrl, field_validator
+from pydantic import AfterValidator, BaseModel, Field, TypeAdapter, field_validator
+
+
+# ISO 8601 date-time with optional fraction and UTC offset, e.g.
+# 2024-01-31T12:00:00.123456Z. The day is only range-checked to 01-31 here;
+# validate_iso8601 checks it against the length of the month.
+_ISO8601_RE = re.compile(
+    r"(?P<year>(?!0000)\d{4})-(?P<month>0[1-9]|1[0-2])-(?P<day>0[1-9]|[12]\d|3[01])"
+    r"[T ](?:[01]\d|2[0-3]):[0-5]\d:[0-5]\d(?:\.\d+)?"
+    r"(?:Z|[+-]\d{2}:\d{2})?"
+)
+
+
+def _check_http_url(value: str) -> str:
+    """Accept http(s) URLs by scheme prefix, without building a URL object"""
+    if not value[:8].lower().startswith(("http://", "https://")):
+        raise ValueError(f"URL must start with http:// or https://: {value}")
+    return value
+
+
+# URL field that stays a plain str on the model and in model_dump()
+HttpUrlStr = Annotated[str, AfterValidator(_check_http_url)]
 
 
 # ============================================================================
@@ -59,7 +81,7 @@ class ScrapingMethod(str, Enum):
 
 class DiscoveredEndpoint(BaseModel):
     """API endpoint discovered during investigation"""
-    url: HttpUrl = Field(..., description="Endpoint URL")
+    url: HttpUrlStr = Field(..., description="Endpoint URL")
     method: str = Field(default="GET", description="HTTP method")
     response_type: str = Field(..., description="Content type")
     confidence: ConfidenceLevel = Field(..., description="Confidence level")
@@ -79,7 +101,7 @@ class InvestigationMetadata(BaseModel):
 
 class InvestigationReport(BaseModel):
     """Complete investigation report"""
-    target_url: HttpUrl = Field(..., description="URL that was investigated")
+    target_url: HttpUrlStr = Field(..., description="URL that was investigated")
     timestamp: str = Field(..., description="Investigation timestamp (ISO 8601)")
     discovered_endpoints: List[DiscoveredEndpoint] = Field(default_factory=list)
     platform_detected: PlatformType = Field(...)
@@ -139,7 +161,7 @@ class DOMSelectorMap(BaseModel):
     item_container_selector: str = Field(...)
     field_selectors: Dict[str, FieldSelector] = Field(..., min_length=4)
     confidence_scores: Dict[str, float] = Field(...)
-    page_url: HttpUrl = Field(...)
+    page_url: HttpUrlStr = Field(...)
     analysis_timestamp: str = Field(...)
     total_items_found: int = Field(..., ge=0)
     notes: Optional[str] = Field(None)
@@ -170,11 +192,13 @@ class ScrapedItem(BaseModel):
     @classmethod
     def validate_iso8601(cls, v: str) -> str:
         """Validate ISO 8601 format"""
-        try:
-            datetime.fromisoformat(v.replace('Z', '+00:00'))
-            return v
-        except ValueError:
+        match = _ISO8601_RE.fullmatch(v)
+        if not match:
             raise ValueError(f"Invalid ISO 8601 timestamp: {v}")
+        _, days_in_month = calendar.monthrange(int(match["year"]), int(match["month"]))
+        if int(match["day"]) > days_in_month:
+            raise ValueError(f"Invalid ISO 8601 timestamp: {v} (day is out of range for month)")
+        return v
 
 
 class ItemsOutput(BaseModel):
@@ -183,13 +207,17 @@ class ItemsOutput(BaseModel):
     items: List[ScrapedItem] = Field(..., description="List of scraped items")
 
 
+# Built once at import; validates a whole item list in one pydantic-core call
+_ITEMS_ADAPTER = TypeAdapter(List[ScrapedItem])
+
+
 # ============================================================================
 # Metadata Output Models
 # ============================================================================
 
 class ScrapingSession(BaseModel):
     """Scraping session information"""
-    source_url: HttpUrl = Field(...)
+    source_url: HttpUrlStr = Field(...)
     source_name: str = Field(..., min_length=1)
     scrape_timestamp_start: str = Field(...)
     scrape_timestamp_end: str = Field(...)
@@ -323,6 +351,11 @@ def validate_items_output(data: dict) -> ItemsOutput:
     return ItemsOutput.model_validate(data)
 
 
+def validate_scraped_items(data: list) -> List[ScrapedItem]:
+    """Validate a plain list of scraped items in one batch"""
+    return _ITEMS_ADAPTER.validate_python(data)
+
+
 def validate_metadata_output(data: dict) -> MetadataOutput:
     """Validate metadata output data"""
     return MetadataOutput.model_validate(data)
@@ -418,14 +418,13 @@ def main():
     report = run_qa_crosscheck(args.items_file, args.metadata_file, thresholds)
 
     # Save or print report
-    report_dict = report.model_dump()
+    report_json = report.model_dump_json(indent=2)
 
     if args.output:
-        with open(args.output, "w") as f:
-            json.dump(report_dict, f, indent=2)
+        args.output.write_text(report_json, encoding="utf-8")
 
     # Print summary to stdout
-    print(json.dumps(report_dict, indent=2))
+    print(report_json)
 
     # Exit with appropriate code
     sys.exit(0 if report.status == "PASS" else 1)
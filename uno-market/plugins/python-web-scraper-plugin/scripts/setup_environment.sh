@@ -102,10 +102,10 @@ install_dependencies() {
 
     if [[ "$PACKAGE_MANAGER" == "uv" ]]; then
         uv pip install --upgrade pip
-        uv pip install requests playwright playwright-stealth pydantic libcst structlog pytest
+        uv pip install requests aiohttp pyahocorasick orjson ijson uvloop numpy playwright playwright-stealth pydantic libcst structlog pytest
     else
         pip3 install --upgrade pip
-        pip3 install requests playwright playwright-stealth pydantic libcst structlog pytest
+        pip3 install requests aiohttp pyahocorasick orjson ijson uvloop numpy playwright playwright-stealth pydantic libcst structlog pytest
     fi
 
     log_info "Dependencies installed ✓"
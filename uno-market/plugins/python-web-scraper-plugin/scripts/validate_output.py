@@ -13,7 +13,9 @@ from typing import Dict, List, Tuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
-from models import ScrapedItem, ItemsOutput, MetadataOutput, FieldCompleteness
+from pydantic import ValidationError
+
+from models import ScrapedItem, ItemsOutput, MetadataOutput, FieldCompleteness, validate_scraped_items
 
 
 # ANSI color codes for terminal output
@@ -42,28 +44,34 @@ def validate_items_schema(items: List[Dict], strict: bool = False) -> Tuple[bool
     errors = []
     warnings = []
 
-    for idx, item_data in enumerate(items):
-        try:
-            # Validate with Pydantic
-            item = ScrapedItem(**item_data)
-
-            # Additional strict checks
-            if strict:
-                if not item.title or not item.title.strip():
-                    warnings.append(f"Item {idx}: title is empty or whitespace")
-
-                if item.price and item.price.amount <= 0:
-                    warnings.append(f"Item {idx}: price amount is zero or negative")
-
-                if not item.image_urls or len(item.image_urls) == 0:
-                    warnings.append(f"Item {idx}: no image URLs")
-
-        except Exception as e:
-            error_msg = str(e)
-            # Truncate very long error messages
-            if len(error_msg) > 150:
-                error_msg = error_msg[:150] + "..."
-            errors.append(f"Item {idx}: {error_msg}")
+    try:
+        # One pydantic-core call for the whole list; only a list that fails
+        # is re-validated item by item to attribute each error
+        validated = list(enumerate(validate_scraped_items(items)))
+    except ValidationError:
+        validated = []
+        for idx, item_data in enumerate(items):
+            try:
+                # Validate with Pydantic
+                validated.append((idx, ScrapedItem(**item_data)))
+            except Exception as e:
+                error_msg = str(e)
+                # Truncate very long error messages
+                if len(error_msg) > 150:
+                    error_msg = error_msg[:150] + "..."
+                errors.append(f"Item {idx}: {error_msg}")
+
+    # Additional strict checks
+    if strict:
+        for idx, item in validated:
+            if not item.title or not item.title.strip():
+                warnings.append(f"Item {idx}: title is empty or whitespace")
+
+            if item.price and item.price.amount <= 0:
+                warnings.append(f"Item {idx}: price amount is zero or negative")
+
+            if not item.image_urls or len(item.image_urls) == 0:
+                warnings.append(f"Item {idx}: no image URLs")
 
     # In strict mode, warnings become errors
     if strict and warnings:
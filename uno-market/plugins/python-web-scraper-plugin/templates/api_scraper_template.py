@@ -5,7 +5,6 @@ Template for generating API-based scrapers with Pydantic validation
 Implements T031 [US1] - API scraper template
 """
 
-import json
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -244,7 +243,7 @@ def scrape_all():
     # Create items output
     items_output = ItemsOutput(
         metadata_file=metadata_filename,
-        items=[item.model_dump() for item in all_items]
+        items=all_items
     )
 
     # Create metadata output
@@ -287,12 +286,10 @@ def scrape_all():
     items_path = output_dir / items_filename
     metadata_path = output_dir / metadata_filename
 
-    with open(items_path, "w") as f:
-        json.dump(items_output.model_dump(), f, indent=2)
+    items_path.write_text(items_output.model_dump_json(indent=2), encoding="utf-8")
     print(f"✓ Items saved: {items_path}")
 
-    with open(metadata_path, "w") as f:
-        json.dump(metadata_output.model_dump(), f, indent=2)
+    metadata_path.write_text(metadata_output.model_dump_json(indent=2), encoding="utf-8")
     print(f"✓ Metadata saved: {metadata_path}")
 
     print(f"\nData Quality Score: {quality_score}/100")
@@ -6,7 +6,6 @@ Implements T032 [US1] - Browser scraper template
 """
 
 import asyncio
-import json
 import re
 import sys
 from datetime import datetime
@@ -100,15 +99,11 @@ async def extract_item(container) -> ScrapedItem:
 
     # Extract image URLs
     try:
-        image_elems = await container.query_selector_all(IMAGE_SELECTOR)
-        image_urls = []
-        for img_elem in image_elems:
-            src = await img_elem.get_attribute("src")
-            data_src = await img_elem.get_attribute("data-src")
-            if src:
-                image_urls.append(src)
-            elif data_src:
-                image_urls.append(data_src)
+        # One round-trip for every image's src (or data-src when src is empty)
+        image_urls = await container.eval_on_selector_all(
+            IMAGE_SELECTOR,
+            "els => els.map(e => e.getAttribute('src') || e.getAttribute('data-src')).filter(Boolean)"
+        )
         item_data["image_urls"] = image_urls
     except Exception as e:
         print(f"Error extracting images: {e}", file=sys.stderr)
@@ -385,7 +380,7 @@ async def scrape_all():
     # Create items output
     items_output = ItemsOutput(
         metadata_file=metadata_filename,
-        items=[item.model_dump() for item in all_items]
+        items=all_items
     )
 
     # Create metadata output
@@ -428,12 +423,10 @@ async def scrape_all():
     items_path = output_dir / items_filename
     metadata_path = output_dir / metadata_filename
 
-    with open(items_path, "w") as f:
-        json.dump(items_output.model_dump(), f, indent=2)
+    items_path.write_text(items_output.model_dump_json(indent=2), encoding="utf-8")
     print(f"✓ Items saved: {items_path}")
 
-    with open(metadata_path, "w") as f:
-        json.dump(metadata_output.model_dump(), f, indent=2)
+    metadata_path.write_text(metadata_output.model_dump_json(indent=2), encoding="utf-8")
     print(f"✓ Metadata saved: {metadata_path}")
 
     print(f"\nData Quality Score: {quality_score}/100")
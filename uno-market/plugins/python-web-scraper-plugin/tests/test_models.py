@@ -0,0 +1,42 @@
+"""Tests for scripts/models.py"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from models import ScrapedItem
+
+
+def _item(scraped_at: str) -> dict:
+    return {
+        "title": "Widget",
+        "url": "https://example.com/widget",
+        "scraped_at": scraped_at,
+    }
+
+
+@pytest.mark.parametrize("scraped_at", [
+    "2024-01-31T12:00:00Z",
+    "2024-02-29T10:00:00Z",
+    "2024-01-31T12:00:00.123456+02:00",
+    "2024-12-31 23:59:59",
+])
+def test_scraped_at_accepts_valid_timestamps(scraped_at):
+    assert ScrapedItem(**_item(scraped_at)).scraped_at == scraped_at
+
+
+@pytest.mark.parametrize("scraped_at", [
+    "2024-02-30T10:00:00Z",
+    "2023-02-29T10:00:00Z",
+    "2024-04-31T10:00:00Z",
+    "2024-13-01T10:00:00Z",
+    "0000-01-01T10:00:00Z",
+    "2024-01-01",
+    "not a timestamp",
+])
+def test_scraped_at_rejects_invalid_timestamps(scraped_at):
+    with pytest.raises(ValidationError):
+        ScrapedItem(**_item(scraped_at))